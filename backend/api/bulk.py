@@ -0,0 +1,57 @@
+CREATED = 'created'
+EXISTS = 'exists'
+DELETED = 'deleted'
+NOT_FOUND = 'not_found'
+INVALID = 'invalid'
+
+
+def bulk_add(queryset, model, user, field, ids, invalid_ids=()):
+    """Adds the objects with the given ids to a list of the user
+    (favorites, shopping list, subscriptions) with one insert.
+    Returns the status of every id.
+    """
+    ids = list(dict.fromkeys(ids))
+    found = set(
+        queryset.filter(
+            id__in=ids
+        ).exclude(
+            id__in=invalid_ids
+        ).values_list('id', flat=True)
+    )
+    existing = set(
+        model.objects.filter(
+            user=user, **{f'{field}__in': found}
+        ).values_list(field, flat=True)
+    )
+    model.objects.bulk_create(
+        [model(user=user, **{field: pk})
+         for pk in ids if pk in found and pk not in existing],
+        ignore_conflicts=True
+    )
+    results = []
+    for pk in ids:
+        if pk in invalid_ids:
+            item_status = INVALID
+        elif pk not in found:
+            item_status = NOT_FOUND
+        elif pk in existing:
+            item_status = EXISTS
+        else:
+            item_status = CREATED
+        results.append({'id': pk, 'status': item_status})
+    return results
+
+
+def bulk_delete(model, user, field, ids):
+    """Removes the objects with the given ids from a list of the user
+    with one delete. Returns the status of every id.
+    """
+    ids = list(dict.fromkeys(ids))
+    queryset = model.objects.filter(user=user, **{f'{field}__in': ids})
+    existing = set(queryset.values_list(field, flat=True))
+    if existing:
+        queryset.delete()
+    return [
+        {'id': pk, 'status': DELETED if pk in existing else NOT_FOUND}
+        for pk in ids
+    ]
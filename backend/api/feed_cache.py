@@ -0,0 +1,88 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.filters import RecipeFilter
+from api.metrics import FEED_CACHE_LOOKUPS
+from recipes.feed import feed_version
+
+from foodgram.caches import cache_shared
+
+# Filters depending on the user, their feeds are not cached.
+PERSONAL_FILTERS = ('is_favorited', 'is_in_shopping_cart')
+SHARED_FILTERS = tuple(
+    name for name in RecipeFilter.base_filters
+    if name not in PERSONAL_FILTERS
+)
+
+
+def feed_cache_key(request):
+    """Key of the filters of the request, the same for the same filters
+    in any order. None for the feeds filtered by the user.
+    """
+    params = request.query_params
+    if request.user.is_authenticated and any(
+            params.get(name) for name in PERSONAL_FILTERS):
+        return None
+    filters = '&'.join(
+        f'{name}={",".join(sorted(set(params.getlist(name))))}'
+        for name in SHARED_FILTERS if name in params
+    )
+    return md5(filters.encode()).hexdigest()
+
+
+class CachedIdList:
+    """Ordered recipe ids for the Django paginator. The count and the
+    pages are cached for FEED_CACHE_TIMEOUT, the queryset is only built
+    and filtered on a miss.
+    """
+    ordered = True
+
+    def __init__(self, build_queryset, key):
+        self.build_queryset = build_queryset
+        self.prefix = f'feed:{feed_version()}:{key}'
+        self._queryset = None
+
+    @property
+    def queryset(self):
+        if self._queryset is None:
+            self._queryset = self.build_queryset()
+        return self._queryset
+
+    def cached(self, name, compute):
+        key = f'{self.prefix}:{name}'
+        value = cache.get(key)
+        if value is not None:
+            FEED_CACHE_LOOKUPS.labels('hit').inc()
+            return value
+        FEED_CACHE_LOOKUPS.labels('miss').inc()
+        value = compute()
+        cache.set(key, value, settings.FEED_CACHE_TIMEOUT)
+        return value
+
+    def count(self):
+        return self.cached('count', lambda: self.queryset.count())
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[0:self.count()])
+
+    def __getitem__(self, page):
+        return self.cached(
+            f'{page.start}:{page.stop}', lambda: list(self.queryset[page]))
+
+
+def cached_feed_ids(request, build_queryset):
+    """Recipe ids of the feed, from the cache unless the feed
+    is filtered by the user. Without a cache shared by the processes
+    the feed version is per process and a change made through another
+    process would not invalidate the cached feeds, so none is cached.
+    """
+    key = feed_cache_key(request) if cache_shared() else None
+    if key is None:
+        FEED_CACHE_LOOKUPS.labels('bypass').inc()
+        return build_queryset()
+    return CachedIdList(build_queryset, key)
@@ -0,0 +1,112 @@
+import copy
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_names(request, param):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def model_columns(model, names):
+    """Names of the concrete model fields among names,
+    suitable for QuerySet.only().
+    """
+    return [
+        field.name for field in model._meta.concrete_fields
+        if field.name in names
+    ]
+
+
+class SparseFieldsetsMixin:
+    """Serializer mixin leaving only the fields listed in the 'fields'
+    of the context. The relations in collapsed_fields are replaced
+    by their collapsed form (ids) unless listed in the 'expand'.
+    Nested serializers are not trimmed.
+    """
+    collapsed_fields = {}
+
+    def is_top_level(self):
+        parent = self.parent
+        return parent is None or (
+            isinstance(parent, serializers.ListSerializer)
+            and parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None or not self.is_top_level():
+            return fields
+        expand = self.context.get('expand', ())
+        for name in list(fields):
+            if name not in requested:
+                del fields[name]
+            elif name in self.collapsed_fields and name not in expand:
+                fields[name] = copy.deepcopy(self.collapsed_fields[name])
+        return fields
+
+
+class SparseFieldsetsViewMixin:
+    """Handles ?fields=a,b and ?expand=c for the safe methods
+    of the actions in fieldsets_actions (action -> serializer class).
+    The names are passed to the serializer context and to select_fields(),
+    which limits the columns and the relations loaded by the queryset.
+    Without ?fields= all the fields are returned expanded.
+    """
+    fieldsets_actions = {}
+
+    def get_fieldsets(self):
+        """Returns the requested and the expanded field names,
+        or None if the action does not support sparse fieldsets.
+        """
+        if not hasattr(self, '_fieldsets'):
+            self._fieldsets = self.parse_fieldsets()
+        return self._fieldsets
+
+    def parse_fieldsets(self):
+        serializer_class = self.fieldsets_actions.get(
+            getattr(self, 'action', None))
+        if (serializer_class is None
+                or self.request.method not in SAFE_METHODS):
+            return None
+        available = set(serializer_class.Meta.fields)
+        fields = parse_names(self.request, FIELDS_PARAM)
+        expand = parse_names(self.request, EXPAND_PARAM)
+        unknown = ((fields or set()) | (expand or set())) - available
+        if unknown:
+            raise ValidationError({
+                FIELDS_PARAM: 'Неизвестные поля: {}.'.format(
+                    ', '.join(sorted(unknown)))
+            })
+        if fields is None:
+            return available, available
+        return fields, expand or set()
+
+    def select_fields(self, queryset, fields, expand):
+        return queryset
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fieldsets = self.get_fieldsets()
+        if fieldsets is None:
+            return queryset
+        return self.select_fields(queryset, *fieldsets)
+
+    def get_serializer_context(self):
+        fieldsets = self.get_fieldsets()
+        if fieldsets is None:
+            return super().get_serializer_context()
+        fields, expand = fieldsets
+        return {
+            **super().get_serializer_context(),
+            'fields': fields,
+            'expand': expand,
+        }
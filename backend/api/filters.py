@@ -46,6 +46,10 @@ class RecipeFilter(FilterSet):
     is_in_shopping_cart = filters.BooleanFilter(
         method='filter_is_in_shopping_cart'
     )
+    ordering = filters.ChoiceFilter(
+        choices=(('trending', 'trending'),),
+        method='filter_ordering'
+    )
 
     class Meta:
         model = Recipe
@@ -62,3 +66,11 @@ class RecipeFilter(FilterSet):
         if value and not user.is_anonymous:
             return queryset.filter(shopping_list__user=user)
         return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        """Only the ranked recipes, the highest score first,
+        read by trending_score_idx.
+        """
+        return queryset.filter(
+            trending__isnull=False
+        ).order_by('-trending__score', '-id')
@@ -0,0 +1,194 @@
+import json
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, connection, transaction
+
+from api.serializers import RecipeImportSerializer
+from jobs.queue import job
+from recipes.feed import invalidate_feed
+from recipes.jobs import release_image
+from recipes.models import Ingredient, Recipe, RecipeIngredients, Tag
+from users.models import User
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def collect_ids(records):
+    """Collects ingredient and tag ids of all the records of a chunk
+    so that they are checked with one query per model.
+    """
+    ingredient_ids, tag_ids = set(), set()
+    for _, data in records:
+        ingredients = data.get('ingredients')
+        if isinstance(ingredients, list):
+            ingredient_ids.update(
+                to_int(item.get('id')) for item in ingredients
+                if isinstance(item, dict)
+            )
+        tags = data.get('tags')
+        if isinstance(tags, list):
+            tag_ids.update(to_int(tag) for tag in tags)
+    ingredient_ids.discard(None)
+    tag_ids.discard(None)
+    return ingredient_ids, tag_ids
+
+
+class RecipeImporter:
+    """Imports recipes from newline-delimited JSON in chunks.
+    Every line has the same format as the body of POST /api/recipes/.
+    Invalid lines are reported and skipped, the rest of the batch is saved.
+    """
+
+    def __init__(self, author, chunk_size=None, workers=None):
+        self.author = author
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.workers = workers or settings.IMPORT_WORKERS
+        self.created = 0
+        self.errors = []
+
+    def run(self, lines):
+        numbered = enumerate(lines, start=1)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                chunk = list(islice(numbered, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, pool)
+        return {
+            'created': self.created,
+            'failed': len(self.errors),
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+        }
+
+    def add_error(self, line, errors):
+        self.errors.append({'line': line, 'errors': errors})
+
+    def parse(self, chunk):
+        records = []
+        for line, raw in chunk:
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8', errors='replace')
+            if not raw.strip():
+                continue
+            try:
+                data = json.loads(raw)
+            except ValueError as error:
+                self.add_error(line, {'non_field_errors': [str(error)]})
+                continue
+            if not isinstance(data, dict):
+                self.add_error(
+                    line, {'non_field_errors': ['Ожидался объект рецепта!']})
+                continue
+            records.append((line, data))
+        return records
+
+    def validate(self, record, context):
+        line, data = record
+        serializer = RecipeImportSerializer(data=data, context=context)
+        if not serializer.is_valid():
+            return line, None, serializer.errors
+        return line, serializer.validated_data, None
+
+    def build(self, validated_data):
+        """Creates an unsaved recipe and stores its image.
+        Runs in the worker pool.
+        """
+        data = dict(validated_data)
+        image = data.pop('image')
+        data.pop('ingredients')
+        data.pop('tags')
+        recipe = Recipe(author=self.author, **data)
+        recipe.image.save(image.name, image, save=False)
+        return recipe
+
+    def import_chunk(self, chunk, pool):
+        records = self.parse(chunk)
+        if not records:
+            return
+        ingredient_ids, tag_ids = collect_ids(records)
+        context = {'author': self.author, 'existing_ids': {
+            Ingredient: set(Ingredient.objects.filter(
+                id__in=ingredient_ids).values_list('id', flat=True)),
+            Tag: set(Tag.objects.filter(
+                id__in=tag_ids).values_list('id', flat=True)),
+        }}
+        valid = []
+        for line, validated_data, errors in pool.map(
+                lambda record: self.validate(record, context), records):
+            if errors:
+                self.add_error(line, errors)
+            else:
+                valid.append((line, validated_data))
+        if not valid:
+            return
+        recipes = list(pool.map(
+            lambda item: self.build(item[1]), valid))
+        try:
+            self.save(recipes, [validated for _, validated in valid])
+        except DatabaseError as error:
+            for line, _ in valid:
+                self.add_error(line, {'non_field_errors': [str(error)]})
+            # The images were stored before the failed save.
+            for name in {recipe.image.name for recipe in recipes}:
+                release_image.delay(name)
+            return
+        self.created += len(recipes)
+
+    @transaction.atomic
+    def save(self, recipes, validated):
+        if connection.features.can_return_ids_from_bulk_insert:
+            Recipe.objects.bulk_create(recipes)
+        else:
+            for recipe in recipes:
+                recipe.save(force_insert=True)
+        recipe_tag = Recipe.tags.through
+        RecipeIngredients.objects.bulk_create(
+            [RecipeIngredients(
+                recipe=recipe,
+                ingredient_id=ingredient['id'],
+                amount=ingredient['amount']
+            ) for recipe, data in zip(recipes, validated)
+                for ingredient in data['ingredients']]
+        )
+        recipe_tag.objects.bulk_create(
+            [recipe_tag(recipe=recipe, tag_id=tag)
+             for recipe, data in zip(recipes, validated)
+             for tag in data['tags']]
+        )
+        invalidate_feed()
+
+
+def save_import(stream):
+    """Stores the body of an import request for the worker
+    and returns its name in the storage.
+    """
+    with SpooledTemporaryFile() as content:
+        shutil.copyfileobj(stream, content)
+        return default_storage.save(
+            f'imports/{uuid.uuid4().hex}.ndjson', File(content))
+
+
+# Not retried: a failed import may have saved a part of the recipes.
+@job(max_attempts=1)
+def run_import(name, author_id):
+    """Imports the recipes of a file stored by save_import
+    and deletes it, the report is the result of the job.
+    """
+    try:
+        with default_storage.open(name, 'rb') as lines:
+            return RecipeImporter(
+                author=User.objects.get(pk=author_id)).run(lines)
+    finally:
+        default_storage.delete(name)
@@ -0,0 +1,150 @@
+import os
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.http import HttpResponse
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+
+LABELS = ('route', 'method')
+
+REQUEST_LATENCY = Histogram(
+    'foodgram_request_latency_seconds',
+    'Request latency by route.',
+    LABELS,
+)
+REQUEST_COUNT = Counter(
+    'foodgram_requests_total',
+    'Requests by route and status code.',
+    LABELS + ('status',),
+)
+SQL_QUERIES = Histogram(
+    'foodgram_request_sql_queries',
+    'SQL queries per request by route.',
+    LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf')),
+)
+SQL_TIME = Histogram(
+    'foodgram_request_sql_seconds',
+    'Total SQL time per request by route.',
+    LABELS,
+)
+RENDER_TIME = Histogram(
+    'foodgram_request_render_seconds',
+    'Time spent rendering the serialized response by route.',
+    LABELS,
+)
+SERIALIZE_TIME = Histogram(
+    'foodgram_request_serialize_seconds',
+    'Time spent serializing the response data in the view by route, '
+    'with the queries of the serializers.',
+    LABELS,
+)
+RESPONSE_SIZE = Histogram(
+    'foodgram_response_size_bytes',
+    'Response body size by route.',
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, float('inf')),
+)
+FEED_CACHE_LOOKUPS = Counter(
+    'foodgram_feed_cache_lookups',
+    'Feed id cache lookups by result: hit, miss or bypass.',
+    ('result',),
+)
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries and their total time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@contextmanager
+def serialize_timer(request):
+    """Adds the time of the block to the serialization time
+    of the request, recorded by MetricsMiddleware.
+    """
+    request = getattr(request, '_request', request)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request.metrics_serialize_time = (
+            getattr(request, 'metrics_serialize_time', None) or 0
+        ) + time.perf_counter() - start
+
+
+def get_route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.url_name or match.view_name or 'unnamed'
+
+
+class MetricsMiddleware:
+    """Records latency, SQL queries, SQL time, serialization time
+    of the views using serialize_timer, render time and response size
+    for every request, labelled by the resolved route.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path_info == '/metrics':
+            return self.get_response(request)
+        counter = QueryCounter()
+        request.metrics_render_start = None
+        request.metrics_serialize_time = None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        end = time.perf_counter()
+
+        labels = (get_route(request), request.method)
+        REQUEST_LATENCY.labels(*labels).observe(end - start)
+        REQUEST_COUNT.labels(*labels, response.status_code).inc()
+        SQL_QUERIES.labels(*labels).observe(counter.count)
+        SQL_TIME.labels(*labels).observe(counter.duration)
+        if request.metrics_serialize_time is not None:
+            SERIALIZE_TIME.labels(*labels).observe(
+                request.metrics_serialize_time)
+        if request.metrics_render_start is not None:
+            RENDER_TIME.labels(*labels).observe(
+                end - request.metrics_render_start)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+    def process_template_response(self, request, response):
+        request.metrics_render_start = time.perf_counter()
+        return response
+
+
+def metrics_view(request):
+    """Exposes the collected metrics in the Prometheus text format.
+    Aggregates the metrics of all gunicorn workers
+    when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    registry = REGISTRY
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
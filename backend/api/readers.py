@@ -0,0 +1,113 @@
+from rest_framework.response import Response
+
+from recipes.models import (FavoriteRecipes, Follow, Recipe, RecipeIngredients,
+                            ShoppingList, Tag)
+from users.models import User
+
+TAG_FIELDS = ('id', 'name', 'color', 'slug')
+AUTHOR_FIELDS = ('email', 'id', 'username', 'first_name', 'last_name')
+INGREDIENT_FIELDS = {
+    'ingredient__id': 'id',
+    'ingredient__name': 'name',
+    'ingredient__measurement_unit': 'measurement_unit',
+    'amount': 'amount',
+}
+
+
+class ValuesListMixin:
+    """Lists the objects as values() rows instead of serializing
+    model instances. The fields must be plain model fields
+    returned by the serializer as they are.
+    """
+    values_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(
+            self.get_queryset()).values(*self.values_fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+
+
+class RecipeListReader:
+    """Builds the RecipeReadSerializer output for a page of recipe ids
+    from values() rows, with one query per relation.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.user = request.user
+        self.storage = Recipe._meta.get_field('image').storage
+
+    def user_recipe_ids(self, model, ids):
+        if not self.user.is_authenticated:
+            return set()
+        return set(model.objects.filter(
+            user=self.user, recipe_id__in=ids
+        ).values_list('recipe_id', flat=True))
+
+    def authors(self, author_ids):
+        subscribed = set()
+        if self.user.is_authenticated:
+            subscribed = set(Follow.objects.filter(
+                user=self.user, author_id__in=author_ids
+            ).values_list('author_id', flat=True))
+        return {
+            row['id']: {**row, 'is_subscribed': row['id'] in subscribed}
+            for row in User.objects.filter(
+                id__in=author_ids).values(*AUTHOR_FIELDS)
+        }
+
+    def tags(self, ids):
+        tags = {pk: [] for pk in ids}
+        for row in Tag.objects.filter(recipe__in=ids).values(
+                'recipe', *TAG_FIELDS):
+            tags[row.pop('recipe')].append(row)
+        return tags
+
+    def ingredients(self, ids):
+        ingredients = {pk: [] for pk in ids}
+        for row in RecipeIngredients.objects.filter(
+                recipe_id__in=ids).values('recipe_id', *INGREDIENT_FIELDS):
+            ingredients[row['recipe_id']].append({
+                name: row[lookup] for lookup, name in INGREDIENT_FIELDS.items()
+            })
+        return ingredients
+
+    def image_url(self, name):
+        if not name:
+            return None
+        return self.request.build_absolute_uri(self.storage.url(name))
+
+    def build(self, ids):
+        """Recipes of the ids in their order. The ids of the recipes
+        deleted since the page of ids was cached are skipped.
+        """
+        rows = {
+            row['id']: row for row in Recipe.objects.filter(
+                id__in=ids
+            ).order_by().values(
+                'id', 'author_id', 'name', 'image', 'text', 'cooking_time',
+                'views')
+        }
+        authors = self.authors({row['author_id'] for row in rows.values()})
+        tags = self.tags(rows)
+        ingredients = self.ingredients(rows)
+        favorited = self.user_recipe_ids(FavoriteRecipes, rows)
+        in_shopping_cart = self.user_recipe_ids(ShoppingList, rows)
+        return [
+            {
+                'id': pk,
+                'tags': tags[pk],
+                'author': authors[rows[pk]['author_id']],
+                'ingredients': ingredients[pk],
+                'is_favorited': pk in favorited,
+                'is_in_shopping_cart': pk in in_shopping_cart,
+                'name': rows[pk]['name'],
+                'image': self.image_url(rows[pk]['image']),
+                'text': rows[pk]['text'],
+                'cooking_time': rows[pk]['cooking_time'],
+                'views': rows[pk]['views'],
+            } for pk in ids if pk in rows
+        ]
@@ -1,15 +1,25 @@
+import os
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
 from djoser.serializers import UserSerializer
 from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers, status
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import SerializerMethodField
 
+from api.fieldsets import SparseFieldsetsMixin
+from api.uploads import (IMAGE_EXTENSIONS, UPLOAD_PREFIX, ClaimedUpload,
+                         direct_uploads_supported, is_upload_of)
+from recipes.feed import invalidate_feed
 from recipes.models import (FavoriteRecipes, Follow, Ingredient, Recipe,
                             RecipeIngredients, ShoppingList, Tag)
 from users.models import User
 
 
-class CustomUserSerializer(UserSerializer):
+class CustomUserSerializer(SparseFieldsetsMixin, UserSerializer):
     """Serializer for creating a new user
     (User registration) or getting user profile.
     Get_is_subscribed - shows whether the current user
@@ -86,9 +96,15 @@ class RecipeIngredientsSerializer(serializers.ModelSerializer):
         model = RecipeIngredients
 
 
-class RecipeReadSerializer(serializers.ModelSerializer):
+class RecipeReadSerializer(SparseFieldsetsMixin,
+                           serializers.ModelSerializer):
     """Serializer for displaying a list of recipes.
+    Tags and author are returned as ids unless expanded.
     """
+    collapsed_fields = {
+        'tags': serializers.PrimaryKeyRelatedField(many=True, read_only=True),
+        'author': serializers.PrimaryKeyRelatedField(read_only=True),
+    }
     tags = TagSerializer(many=True)
     author = CustomUserSerializer()
     ingredients = SerializerMethodField()
@@ -107,18 +123,25 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'image',
             'text',
             'cooking_time',
+            'views',
         )
         read_only_fields = (
             'tags',
             'author',
             'ingredients',
             'is_favorited',
-            'is_in_shopping_cart'
+            'is_in_shopping_cart',
+            'views',
         )
         model = Recipe
 
     def get_ingredients(self, obj):
-        queryset = RecipeIngredients.objects.filter(recipe=obj)
+        """Uses the ingredients prefetched by RecipeViewSet if there are any.
+        """
+        if 'recipes' in getattr(obj, '_prefetched_objects_cache', {}):
+            queryset = obj.recipes.all()
+        else:
+            queryset = obj.recipes.select_related('ingredient')
         return RecipeIngredientsSerializer(queryset, many=True).data
 
     def get_is_favorited(self, obj):
@@ -139,10 +162,9 @@ class RecipeReadSerializer(serializers.ModelSerializer):
 class IngredientWriteSerializer(serializers.ModelSerializer):
     """Serializer for adding an ingredient and its amount to the recipe.
     Only needed for RecipeWriteSerializer.
+    Ingredient ids are resolved in bulk by RecipeWriteSerializer.validate.
     """
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all()
-    )
+    id = serializers.IntegerField()
     amount = serializers.IntegerField()
 
     class Meta:
@@ -153,16 +175,60 @@ class IngredientWriteSerializer(serializers.ModelSerializer):
         model = RecipeIngredients
 
 
+class UploadImageField(Base64ImageField):
+    """Image sent as base64 or as the name of a direct upload
+    of the current user returned by ImageUploadSerializer.
+    Without a request, as in the imports, the uploads are
+    the ones of the author in the context.
+    """
+
+    def upload_user(self):
+        request = self.context.get('request')
+        if request is not None:
+            return request.user
+        return self.context.get('author')
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str) or not data.startswith(UPLOAD_PREFIX):
+            return super().to_internal_value(data)
+        user = self.upload_user()
+        if (user is None or not direct_uploads_supported()
+                or not is_upload_of(user, data)
+                or not default_storage.exists(data)):
+            raise ValidationError('Загруженное изображение не найдено.')
+        # The policy size limit is not enforced by every S3 implementation.
+        if default_storage.size(data) > settings.DIRECT_UPLOAD_MAX_SIZE:
+            raise ValidationError('Загруженное изображение слишком большое.')
+        return serializers.ImageField.to_internal_value(
+            self, ClaimedUpload(data))
+
+
+class ImageUploadSerializer(serializers.Serializer):
+    """Serializer for requesting a direct upload of a recipe image.
+    """
+    filename = serializers.CharField()
+
+    def validate_filename(self, value):
+        if not direct_uploads_supported():
+            raise ValidationError(
+                'Хранилище не поддерживает прямую загрузку изображений.')
+        extension = os.path.splitext(value)[1].lower()
+        if extension not in IMAGE_EXTENSIONS:
+            raise ValidationError(
+                'Допустимые расширения: {}.'.format(
+                    ', '.join(IMAGE_EXTENSIONS)))
+        return extension
+
+
 class RecipeWriteSerializer(serializers.ModelSerializer):
     """Serializer for creating, editing, deleting a recipe.
     """
-    tags = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True
+    tags = serializers.ListField(
+        child=serializers.IntegerField()
     )
     author = CustomUserSerializer(read_only=True)
     ingredients = IngredientWriteSerializer(many=True)
-    image = Base64ImageField()
+    image = UploadImageField()
 
     class Meta:
         fields = (
@@ -177,70 +243,149 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         )
         model = Recipe
 
+    def get_existing_ids(self, model, ids):
+        return set(
+            model.objects.filter(id__in=ids).values_list('id', flat=True)
+        )
+
+    def check_existing(self, model, ids, field, message):
+        """Checks with a single query that all the ids exist.
+        """
+        missing = sorted(set(ids) - self.get_existing_ids(model, ids))
+        if missing:
+            raise serializers.ValidationError({
+                field: message.format(', '.join(map(str, missing)))
+            })
+
     def validate(self, data):
-        ingredients = data['ingredients']
-        if not ingredients:
-            raise serializers.ValidationError(
-                'Необходимо добавить хотя бы 1 ингредиент!')
-        ingredients_list = []
-        for item in ingredients:
-            ingredient = item['id']
-            if ingredient in ingredients_list:
+        if 'ingredients' in data:
+            ingredients = data['ingredients']
+            if not ingredients:
+                raise serializers.ValidationError(
+                    'Необходимо добавить хотя бы 1 ингредиент!')
+            ingredient_ids = [item['id'] for item in ingredients]
+            if len(set(ingredient_ids)) != len(ingredient_ids):
                 raise serializers.ValidationError({
                     'ingredients': 'Ингредиент должен быть уникальным!'
                 })
-            ingredients_list.append(ingredient)
-            if int(item['amount']) <= 0:
+            if any(item['amount'] <= 0 for item in ingredients):
                 raise serializers.ValidationError({
                     'amount': 'Количество ингредиента должно быть больше 0!'
                 })
+            self.check_existing(
+                Ingredient, ingredient_ids, 'ingredients',
+                'Ингредиенты с id {} не существуют!'
+            )
 
-        tags = data['tags']
-        if not tags:
-            raise serializers.ValidationError({
-                'tags': 'Необходимо добавить хотя бы 1 тег!'
-            })
-        tags_list = []
-        for item in tags:
-            if item in tags_list:
+        if 'tags' in data:
+            tags = data['tags']
+            if not tags:
+                raise serializers.ValidationError({
+                    'tags': 'Необходимо добавить хотя бы 1 тег!'
+                })
+            if len(set(tags)) != len(tags):
                 raise serializers.ValidationError({
                     'tags': 'Тег должен быть уникальным!'
                 })
-            tags_list.append(item)
+            self.check_existing(
+                Tag, tags, 'tags', 'Теги с id {} не существуют!'
+            )
 
-        cooking_time = data['cooking_time']
-        if int(cooking_time) <= 0:
+        cooking_time = data.get('cooking_time')
+        if cooking_time is not None and int(cooking_time) <= 0:
             raise serializers.ValidationError({
                 'cooking_time': 'Время приготовления должно быть больше 0!'
             })
         return data
 
     def create_ingredients(self, ingredients, recipe):
+        if not ingredients:
+            return
         RecipeIngredients.objects.bulk_create(
             [RecipeIngredients(
                 recipe=recipe,
-                ingredient=ingredient.get('id'),
+                ingredient_id=ingredient.get('id'),
                 amount=ingredient.get('amount')
             ) for ingredient in ingredients]
         )
 
+    def create_tags(self, tags, recipe):
+        if not tags:
+            return
+        recipe_tag = Recipe.tags.through
+        recipe_tag.objects.bulk_create(
+            [recipe_tag(recipe=recipe, tag_id=tag) for tag in tags]
+        )
+
+    @transaction.atomic
     def create(self, validated_data):
         author = self.context.get('request').user
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
         recipe = Recipe.objects.create(author=author, **validated_data)
-        recipe.tags.set(tags)
+        self.create_tags(tags, recipe)
         self.create_ingredients(ingredients, recipe)
         return recipe
 
+    def update_ingredients(self, ingredients, recipe):
+        """Writes only the difference between the stored
+        and the submitted ingredients of the recipe.
+        """
+        existing = {
+            item.ingredient_id: item
+            for item in RecipeIngredients.objects.filter(recipe=recipe)
+        }
+        submitted = {
+            ingredient.get('id'): ingredient.get('amount')
+            for ingredient in ingredients
+        }
+        removed = [
+            item.id for ingredient_id, item in existing.items()
+            if ingredient_id not in submitted
+        ]
+        if removed:
+            RecipeIngredients.objects.filter(id__in=removed).delete()
+        changed = []
+        for ingredient_id, amount in submitted.items():
+            item = existing.get(ingredient_id)
+            if item is not None and item.amount != amount:
+                item.amount = amount
+                changed.append(item)
+        if changed:
+            RecipeIngredients.objects.bulk_update(changed, ['amount'])
+        self.create_ingredients(
+            [ingredient for ingredient in ingredients
+             if ingredient.get('id') not in existing],
+            recipe
+        )
+
+    def update_tags(self, tags, recipe):
+        """Adds the new tags and removes the missing ones,
+        leaving the unchanged tags of the recipe untouched.
+        """
+        recipe_tag = Recipe.tags.through
+        existing = set(
+            recipe_tag.objects.filter(
+                recipe=recipe
+            ).values_list('tag_id', flat=True)
+        )
+        removed = existing - set(tags)
+        added = [tag for tag in tags if tag not in existing]
+        if removed:
+            recipe_tag.objects.filter(
+                recipe=recipe, tag_id__in=removed
+            ).delete()
+        self.create_tags(added, recipe)
+        if removed or added:
+            invalidate_feed()
+
+    @transaction.atomic
     def update(self, instance, validated_data):
         if 'ingredients' in validated_data:
-            ingredients = validated_data.pop('ingredients')
-            instance.ingredients.clear()
-            self.create_ingredients(ingredients, instance)
+            self.update_ingredients(
+                validated_data.pop('ingredients'), instance)
         if 'tags' in validated_data:
-            instance.tags.set(
-                validated_data.pop('tags'))
+            self.update_tags(validated_data.pop('tags'), instance)
         return super().update(
             instance, validated_data)
 
@@ -252,6 +397,16 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
             }).data
 
 
+class RecipeImportSerializer(RecipeWriteSerializer):
+    """Serializer for validating a recipe of a bulk import.
+    Ingredient and tag ids are checked against the ids
+    loaded once for the whole chunk of recipes,
+    direct uploads against the author in the context.
+    """
+    def get_existing_ids(self, model, ids):
+        return self.context['existing_ids'][model]
+
+
 class BriefRecipeSerializer(serializers.ModelSerializer):
     """Serializer for displaying a brief recipe.
     Onle needed for FavoriteRecipesSerilizer, ShoppingListSerislizer
@@ -267,25 +422,24 @@ class BriefRecipeSerializer(serializers.ModelSerializer):
         model = Recipe
 
 
-class FavoriteRecipesSerializer(serializers.ModelSerializer):
-    """Serializer for displaying a list of favorite recipes.
+class UserRecipeSerializer(serializers.ModelSerializer):
+    """Base serializer for adding a recipe to a list of the user.
+    A repeated addition is rejected by the unique constraint
+    of the model, so no separate existence check is needed.
     """
-    class Meta:
-        fields = ('user', 'recipe')
-        model = FavoriteRecipes
+    user = serializers.HiddenField(
+        default=serializers.CurrentUserDefault()
+    )
+    duplicate_message = None
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if not request or request.user.is_anonymous:
-            return False
-        recipe = data['recipe']
-        if FavoriteRecipes.objects.filter(
-            user=request.user, recipe=recipe
-        ).exists():
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
             raise serializers.ValidationError({
-                'status': 'Вы уже добавили этот рецепт в избранное!'
+                'status': self.duplicate_message
             })
-        return data
 
     def to_representation(self, instance):
         request = self.context.get('request')
@@ -294,34 +448,38 @@ class FavoriteRecipesSerializer(serializers.ModelSerializer):
             instance.recipe, context=context).data
 
 
-class ShoppingListSerializer(serializers.ModelSerializer):
+class FavoriteRecipesSerializer(UserRecipeSerializer):
+    """Serializer for displaying a list of favorite recipes.
+    """
+    duplicate_message = 'Вы уже добавили этот рецепт в избранное!'
+
+    class Meta:
+        fields = ('user', 'recipe')
+        model = FavoriteRecipes
+
+
+class ShoppingListSerializer(UserRecipeSerializer):
     """Serializer for displaying a list of recipes for shopping.
     """
+    duplicate_message = 'Вы уже добавили этот рецепт в шопинг лист!'
+
     class Meta:
         model = ShoppingList
         fields = ('user', 'recipe')
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if not request or request.user.is_anonymous:
-            return False
-        recipe = data['recipe']
-        if ShoppingList.objects.filter(
-            user=request.user, recipe=recipe
-        ).exists():
-            raise serializers.ValidationError({
-                'status': 'Вы уже добавили этот рецепт в шопинг лист!'
-            })
-        return data
 
-    def to_representation(self, instance):
-        request = self.context.get('request')
-        context = {'request': request}
-        return BriefRecipeSerializer(
-            instance.recipe, context=context).data
+class BulkIdsSerializer(serializers.Serializer):
+    """Serializer for a list of ids
+    passed to the bulk favorite, shopping cart and subscribe endpoints.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_IDS
+    )
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """Serializer for displaying a list of subscriptions of the user.
     """
     is_subscribed = SerializerMethodField(read_only=True)
@@ -348,11 +506,6 @@ class FollowSerializer(serializers.ModelSerializer):
     def validate(self, data):
         author = self.instance
         user = self.context.get('request').user
-        if Follow.objects.filter(author=author, user=user).exists():
-            raise ValidationError(
-                detail='Вы уже подписались на этого автора!',
-                code=status.HTTP_400_BAD_REQUEST
-            )
         if user == author:
             raise ValidationError(
                 detail='Вы не можете подписаться на самого себя!',
@@ -360,6 +513,23 @@ class FollowSerializer(serializers.ModelSerializer):
             )
         return data
 
+    def update(self, instance, validated_data):
+        """Subscribes the current user to the author.
+        A repeated subscription is rejected by the unique constraint.
+        """
+        try:
+            with transaction.atomic():
+                Follow.objects.create(
+                    user=self.context.get('request').user,
+                    author=instance
+                )
+        except IntegrityError:
+            raise ValidationError(
+                detail='Вы уже подписались на этого автора!',
+                code=status.HTTP_400_BAD_REQUEST
+            )
+        return instance
+
     def get_is_subscribed(self, obj):
         request = self.context.get('request')
         return (
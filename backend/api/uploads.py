@@ -0,0 +1,58 @@
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils.functional import cached_property
+
+UPLOAD_PREFIX = 'uploads/'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+
+def direct_uploads_supported():
+    return hasattr(default_storage, 'presigned_upload')
+
+
+def is_upload_of(user, name):
+    return re.fullmatch(
+        rf'{UPLOAD_PREFIX}{user.id}/[0-9a-f]{{32}}\.\w+', name) is not None
+
+
+def create_upload(user, extension):
+    """Reserves a name for an image uploaded by the user directly
+    to the storage and returns it with the pre-signed POST request.
+    """
+    name = f'{UPLOAD_PREFIX}{user.id}/{uuid.uuid4().hex}{extension}'
+    return {
+        'image': name,
+        **default_storage.presigned_upload(
+            name,
+            settings.DIRECT_UPLOAD_MAX_SIZE,
+            settings.DIRECT_UPLOAD_EXPIRES
+        ),
+    }
+
+
+class ClaimedUpload(File):
+    """Direct upload referenced by a recipe. The storage stores it
+    under its content hash and deletes the upload. The upload is not
+    kept open: it is opened and closed by every read.
+    """
+
+    def __init__(self, name):
+        super().__init__(None, os.path.basename(name))
+        self.upload_name = name
+
+    @cached_property
+    def size(self):
+        return default_storage.size(self.upload_name)
+
+    def read(self, *args):
+        with default_storage.open(self.upload_name) as file:
+            return file.read(*args)
+
+    def chunks(self, chunk_size=None):
+        with default_storage.open(self.upload_name) as file:
+            yield from file.chunks(chunk_size)
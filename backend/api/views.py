@@ -1,36 +1,65 @@
-from django.db.models import Sum
+import json
+
+from django.conf import settings
+from django.db.models import Prefetch, Sum
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.permissions import SAFE_METHODS, AllowAny, IsAuthenticated
+from rest_framework.permissions import (SAFE_METHODS, AllowAny, IsAdminUser,
+                                        IsAuthenticated)
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
+from api.bulk import bulk_add, bulk_delete
 from api.download import download_txt
+from api.feed_cache import cached_feed_ids
+from api.fieldsets import FIELDS_PARAM, SparseFieldsetsViewMixin, model_columns
 from api.filters import IngredientFilter, RecipeFilter, TagFilter
+from api.imports import RecipeImporter, run_import, save_import
+from api.metrics import serialize_timer
 from api.pagination import CustomPageNumberPagination
 from api.permissions import IsAuthorOrReadOnly
-from api.serializers import (CustomUserSerializer, FavoriteRecipesSerializer,
-                             FollowSerializer, IngredientSerializer,
+from api.readers import RecipeListReader, ValuesListMixin
+from api.serializers import (BulkIdsSerializer, CustomUserSerializer,
+                             FavoriteRecipesSerializer, FollowSerializer,
+                             ImageUploadSerializer, IngredientSerializer,
                              RecipeReadSerializer, RecipeWriteSerializer,
                              ShoppingListSerializer, TagSerializer)
+from api.uploads import create_upload
+from jobs.models import Job
+from jobs.queue import IMMEDIATE
+from recipes.counters import view_counter
+from recipes.deletion import delete_recipe, delete_user
 from recipes.models import (FavoriteRecipes, Follow, Ingredient, Recipe,
                             RecipeIngredients, ShoppingList, Tag)
 from users.models import User
 
 
-class CustomUserViewSet(UserViewSet):
+class CustomUserViewSet(SparseFieldsetsViewMixin, UserViewSet):
     '''Getting data about users.
     Adding users to subscriptions.
     Deleting users from subscriptions.
     Getting data about subscriptions.
     '''
-    queryset = User.objects.all()
+    queryset = User.objects.filter(is_active=True)
     serializer_class = CustomUserSerializer
     pagination_class = CustomPageNumberPagination
+    fieldsets_actions = {
+        'list': CustomUserSerializer,
+        'retrieve': CustomUserSerializer,
+        'me': CustomUserSerializer,
+        'subscriptions': FollowSerializer,
+    }
+
+    def select_fields(self, queryset, fields, expand):
+        return queryset.only(*model_columns(User, fields | {'id'}))
+
+    def perform_destroy(self, instance):
+        delete_user(instance)
 
     @action(
         detail=True,
@@ -39,62 +68,84 @@ class CustomUserViewSet(UserViewSet):
     )
     def subscribe(self, request, pk):
         user = request.user
-        author = get_object_or_404(User, pk=pk)
 
         if request.method == 'POST':
+            author = get_object_or_404(self.queryset, pk=pk)
             serializer = FollowSerializer(
                 author,
                 data=request.data,
                 context={'request': request}
             )
             serializer.is_valid(raise_exception=True)
-            Follow.objects.create(user=user, author=author)
+            serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        get_object_or_404(
-            Follow,
-            user=user,
-            author=author
-        ).delete()
+        deleted, _ = Follow.objects.filter(user=user, author_id=pk).delete()
+        if not deleted:
+            raise Http404
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='subscribe/bulk',
+        permission_classes=[IsAuthenticated]
+    )
+    def subscribe_bulk(self, request):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        if request.method == 'POST':
+            results = bulk_add(
+                self.queryset, Follow, request.user, 'author_id', ids,
+                invalid_ids={request.user.id}
+            )
+        else:
+            results = bulk_delete(Follow, request.user, 'author_id', ids)
+        return Response({'results': results})
+
     @action(
         detail=False,
         permission_classes=[IsAuthenticated]
     )
     def subscriptions(self, request):
         user = request.user
-        queryset = User.objects.filter(following__user=user)
+        queryset = self.select_fields(
+            self.queryset.filter(following__user=user),
+            *self.get_fieldsets()
+        )
         pages = self.paginate_queryset(queryset)
         serializer = FollowSerializer(
             pages,
             many=True,
-            context={'request': request}
+            context=self.get_serializer_context()
         )
         return self.get_paginated_response(serializer.data)
 
 
-class TagViewSet(ReadOnlyModelViewSet):
+class TagViewSet(ValuesListMixin, ReadOnlyModelViewSet):
     '''Getting data about tags.
     '''
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+    values_fields = TagSerializer.Meta.fields
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TagFilter
     permission_classes = (AllowAny,)
 
 
-class IngredientViewSet(ReadOnlyModelViewSet):
+class IngredientViewSet(ValuesListMixin, ReadOnlyModelViewSet):
     '''Getting data about ingredients.
     '''
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
+    values_fields = IngredientSerializer.Meta.fields
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
     permission_classes = (AllowAny,)
 
 
-class RecipeViewSet(ModelViewSet):
+class RecipeViewSet(SparseFieldsetsViewMixin, ModelViewSet):
     '''Getting data about recipes.
     Creating, editing, deleting recipes.
     Adding recipes to favorites and to shopping list.
@@ -105,12 +156,80 @@ class RecipeViewSet(ModelViewSet):
     pagination_class = CustomPageNumberPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    fieldsets_actions = {
+        'list': RecipeReadSerializer,
+        'retrieve': RecipeReadSerializer,
+    }
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return RecipeReadSerializer
         return RecipeWriteSerializer
 
+    def select_fields(self, queryset, fields, expand):
+        """Loads only the requested columns and relations.
+        """
+        columns = model_columns(Recipe, fields | {'id'})
+        if 'author' in fields and 'author' in expand:
+            queryset = queryset.select_related('author')
+            columns.extend(
+                f'author__{name}' for name in model_columns(
+                    User, CustomUserSerializer.Meta.fields)
+            )
+        if 'tags' in fields:
+            tags = Tag.objects.all()
+            if 'tags' not in expand:
+                tags = tags.only('id')
+            queryset = queryset.prefetch_related(Prefetch('tags', tags))
+        if 'ingredients' in fields:
+            queryset = queryset.prefetch_related(Prefetch(
+                'recipes',
+                RecipeIngredients.objects.select_related('ingredient')
+            ))
+        return queryset.only(*columns)
+
+    def perform_destroy(self, instance):
+        delete_recipe(instance)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Counts the view in the process, the views are written
+        to the database in batches.
+        """
+        instance = self.get_object()
+        if settings.VIEW_COUNTS_ENABLED:
+            view_counter.add(instance.pk)
+        with serialize_timer(request):
+            data = self.get_serializer(instance).data
+        return Response(data)
+
+    def feed_ids(self):
+        return self.filter_queryset(
+            self.get_queryset()
+        ).prefetch_related(None).values_list('id', flat=True)
+
+    def list(self, request, *args, **kwargs):
+        """Builds the full representation from values() rows for the
+        cached page of ids, sparse fieldsets are serialized
+        by RecipeReadSerializer.
+        """
+        if FIELDS_PARAM in request.query_params:
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(queryset)
+            with serialize_timer(request):
+                data = self.get_serializer(
+                    queryset if page is None else page, many=True).data
+            if page is None:
+                return Response(data)
+            return self.get_paginated_response(data)
+        ids = cached_feed_ids(request, self.feed_ids)
+        page = self.paginate_queryset(ids)
+        with serialize_timer(request):
+            data = RecipeListReader(request).build(
+                list(ids) if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
     @action(
         detail=True,
         methods=['post'],
@@ -143,9 +262,89 @@ class RecipeViewSet(ModelViewSet):
     def delete_shopping_cart(self, request, pk):
         return self.delete_from(request=request, pk=pk, model=ShoppingList)
 
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='favorite/bulk',
+        permission_classes=[IsAuthenticated]
+    )
+    def favorite_bulk(self, request):
+        return self.bulk_change(request=request, model=FavoriteRecipes)
+
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='shopping_cart/bulk',
+        permission_classes=[IsAuthenticated]
+    )
+    def shopping_cart_bulk(self, request):
+        return self.bulk_change(request=request, model=ShoppingList)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='uploads',
+        permission_classes=[IsAuthenticated]
+    )
+    def image_upload(self, request):
+        """Returns a pre-signed request uploading a recipe image
+        directly to the storage. The returned image name is then sent
+        as the image of the recipe instead of the base64 content.
+        """
+        serializer = ImageUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = create_upload(
+            request.user, serializer.validated_data['filename'])
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        permission_classes=[IsAdminUser]
+    )
+    def import_recipes(self, request):
+        """Queues the import of recipes of the current user
+        from a newline-delimited JSON body. The report is returned
+        by import_status once the job is done.
+        """
+        if settings.JOBS_BACKEND == IMMEDIATE:
+            report = RecipeImporter(author=request.user).run(request.stream)
+            return Response(report)
+        job = run_import.delay(save_import(request.stream), request.user.pk)
+        return Response(
+            {'id': job.pk, 'status': job.status},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(
+        detail=False,
+        url_path=r'import/(?P<job_id>\d+)',
+        permission_classes=[IsAdminUser]
+    )
+    def import_status(self, request, job_id):
+        job = get_object_or_404(Job, pk=job_id, name=run_import.job_name)
+        return Response({
+            'id': job.pk,
+            'status': job.status,
+            'report': json.loads(job.result) if job.result else None,
+        })
+
+    @staticmethod
+    def bulk_change(request, model):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        if request.method == 'POST':
+            results = bulk_add(
+                Recipe.objects.all(), model, request.user, 'recipe_id', ids)
+        else:
+            results = bulk_delete(model, request.user, 'recipe_id', ids)
+        return Response({'results': results})
+
     @staticmethod
     def add_to(request, pk, serializers):
-        data = {'user': request.user.id, 'recipe': pk}
+        data = {'recipe': pk}
         serializer = serializers(data=data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -153,9 +352,11 @@ class RecipeViewSet(ModelViewSet):
 
     @staticmethod
     def delete_from(request, pk, model):
-        user = request.user
-        recipe = get_object_or_404(Recipe, id=pk)
-        get_object_or_404(model, user=user, recipe=recipe).delete()
+        deleted, _ = model.objects.filter(
+            user=request.user, recipe_id=pk
+        ).delete()
+        if not deleted:
+            raise Http404
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -164,7 +365,8 @@ class RecipeViewSet(ModelViewSet):
     )
     def download_shopping_cart(self, request):
         queryset = RecipeIngredients.objects.filter(
-            recipe__shopping_list__user=request.user
+            recipe__shopping_list__user=request.user,
+            recipe__is_deleted=False
         ).values(
             'ingredient__name',
             'ingredient__measurement_unit'
@@ -0,0 +1,9 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_shared():
+    """Locmem is per process: an entry removed or replaced
+    by one process would stay valid in the others.
+    """
+    return not isinstance(caches['default'], LocMemCache)
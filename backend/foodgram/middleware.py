@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class RoutedMiddleware:
+    """Runs the FULL_STACK_MIDDLEWARE only for the requests outside
+    LEAN_PATH_PREFIXES. The API is authenticated by tokens and does not
+    need sessions, CSRF cookies or messages, so its requests skip them,
+    while the admin keeps the full stack.
+    The chain and the hooks are built the way Django builds MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.view_hooks = []
+        self.template_response_hooks = []
+        self.exception_hooks = []
+        handler = convert_exception_to_response(get_response)
+        for path in reversed(settings.FULL_STACK_MIDDLEWARE):
+            try:
+                middleware = import_string(path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(middleware, 'process_view'):
+                self.view_hooks.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                self.template_response_hooks.append(
+                    middleware.process_template_response)
+            if hasattr(middleware, 'process_exception'):
+                self.exception_hooks.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.full_stack = handler
+
+    @staticmethod
+    def is_lean(request):
+        return request.path_info.startswith(settings.LEAN_PATH_PREFIXES)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.full_stack(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for hook in self.view_hooks:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_lean(request):
+            return response
+        for hook in self.template_response_hooks:
+            response = hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_lean(request):
+            return None
+        for hook in self.exception_hooks:
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
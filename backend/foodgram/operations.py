@@ -0,0 +1,93 @@
+from django.db import NotSupportedError
+from django.db.migrations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+
+def is_postgresql(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def concurrently(schema_editor, statement):
+    """Makes a CREATE INDEX statement concurrent on PostgreSQL.
+    """
+    if is_postgresql(schema_editor):
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError(
+                'Concurrent index operations need a migration '
+                'with atomic = False.'
+            )
+        statement.template = statement.template.replace(
+            'CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1)
+    return statement
+
+
+def drop_index(schema_editor, model, name):
+    if is_postgresql(schema_editor):
+        schema_editor.execute(
+            f'DROP INDEX CONCURRENTLY IF EXISTS '
+            f'{schema_editor.quote_name(name)}'
+        )
+    else:
+        schema_editor.execute(schema_editor._delete_index_sql(model, name))
+
+
+class AddIndexConcurrently(AddIndex):
+    """AddIndex creating the index without blocking the writes
+    to the table on PostgreSQL.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(concurrently(
+                schema_editor, self.index.create_sql(model, schema_editor)))
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            drop_index(schema_editor, model, self.index.name)
+
+    def describe(self):
+        return f'{super().describe()} concurrently'
+
+
+class RemoveFieldIndexConcurrently(Operation):
+    """Drops the single column index of a field without blocking
+    the writes to the table on PostgreSQL. Used with
+    SeparateDatabaseAndState and AlterField(db_index=False).
+    """
+    reversible = True
+
+    def __init__(self, model_name, name):
+        self.model_name = model_name
+        self.name = name
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(
+                schema_editor.connection.alias, model):
+            return
+        column = model._meta.get_field(self.name).column
+        for name in schema_editor._constraint_names(
+                model, [column], index=True, unique=False):
+            drop_index(schema_editor, model, name)
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            field = model._meta.get_field(self.name)
+            schema_editor.execute(concurrently(
+                schema_editor,
+                schema_editor._create_index_sql(model, [field])
+            ))
+
+    def describe(self):
+        return (f'Remove index of field {self.name} '
+                f'on {self.model_name} concurrently')
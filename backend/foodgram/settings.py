@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 from dotenv import load_dotenv
 
@@ -24,23 +25,43 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework.authtoken',
+    'rest_framework_simplejwt.token_blacklist',
     'djoser',
     'django_filters',
     'users.apps.UsersConfig',
     'recipes.apps.RecipesConfig',
     'api.apps.ApiConfig',
+    'monitoring.apps.MonitoringConfig',
+    'jobs.apps.JobsConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'foodgram.middleware.RoutedMiddleware',
+    'monitoring.middleware.ProfilerMiddleware',
+]
+
+# Run by RoutedMiddleware for every path except LEAN_PATH_PREFIXES.
+FULL_STACK_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+LEAN_PATH_PREFIXES = ('/api/', '/metrics')
+
+# The admin checks look for the session, authentication and messages
+# middleware in MIDDLEWARE, they are in FULL_STACK_MIDDLEWARE instead.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', default=True)
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'api.metrics.MetricsMiddleware')
+
 ROOT_URLCONF = 'foodgram.urls'
 
 TEMPLATES = [
@@ -119,6 +140,24 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+MEDIA_STORAGE = os.getenv('MEDIA_STORAGE', default='local')
+
+if MEDIA_STORAGE == 's3':
+    DEFAULT_FILE_STORAGE = 'recipes.s3.S3ContentAddressedStorage'
+    AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME')
+    AWS_S3_ENDPOINT_URL = os.getenv('AWS_S3_ENDPOINT_URL')
+    AWS_S3_REGION_NAME = os.getenv('AWS_S3_REGION_NAME')
+    AWS_S3_CUSTOM_DOMAIN = os.getenv('AWS_S3_CUSTOM_DOMAIN')
+    AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
+    AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
+    AWS_DEFAULT_ACL = None
+    AWS_QUERYSTRING_AUTH = False
+    AWS_S3_OBJECT_PARAMETERS = {
+        'CacheControl': 'public, max-age=31536000, immutable',
+    }
+else:
+    DEFAULT_FILE_STORAGE = 'recipes.storage.ContentAddressedStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 REST_FRAMEWORK = {
@@ -126,13 +165,27 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
+        'users.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
 }
 
+FAST_JSON_ENABLED = os.getenv('FAST_JSON_ENABLED', default=True)
+
+if FAST_JSON_ENABLED:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 DJOSER = {
     'SERIALIZERS': {
         'user': 'api.serializers.CustomUserSerializer',
@@ -145,8 +198,33 @@ DJOSER = {
     'HIDE_USERS': False,
 }
 
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER':
+        'users.authentication.UserTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER':
+        'users.authentication.UserTokenRefreshSerializer',
+}
+
 AUTH_USER_MODEL = 'users.User'
 
+# The token cache must be shared by the workers for logout
+# to take effect in all of them, locmem is per process
+# and disables the token cache.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    }
+}
+
 if DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
     EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -161,3 +239,73 @@ STRING_LEN_FIELD_2: int = 254
 STRING_LEN_FIELD_3: int = 200
 
 STRING_LEN_FIELD_4: int = 7
+
+HTTP_METHOD_LEN: int = 10
+
+BULK_MAX_IDS: int = 100
+
+IMPORT_CHUNK_SIZE: int = 500
+
+IMPORT_WORKERS: int = 4
+
+PROFILER_HEADER: str = 'HTTP_X_PROFILE'
+
+PROFILER_QUERY_PARAM: str = 'profile'
+
+PROFILER_EXPLAIN_TOP: int = 5
+
+PROFILER_STATS_LIMIT: int = 50
+
+SQL_LOG_ENABLED = os.getenv('SQL_LOG_ENABLED', default=False)
+
+SQL_LOG_APPS = ('recipes', 'users')
+
+SQL_LOG_FLUSH_INTERVAL: int = 60
+
+SLOW_QUERY_THRESHOLD: int = 100
+
+SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+
+SLOW_QUERY_LOG_SIZE: int = 1000
+
+AUTH_TOKEN_CACHE_TIMEOUT: int = 300
+
+FEED_CACHE_TIMEOUT: int = 60
+
+# An image stored or reused this recently may belong to a recipe
+# not committed yet, its release is postponed.
+IMAGE_RELEASE_GRACE: int = 60 * 60
+
+DIRECT_UPLOAD_MAX_SIZE: int = 10 * 1024 * 1024
+
+DIRECT_UPLOAD_EXPIRES: int = 600
+
+# 'database' queues the jobs for the run_jobs workers,
+# 'immediate' runs them in the process after the commit.
+JOBS_BACKEND = os.getenv('JOBS_BACKEND', default='database')
+
+JOBS_MAX_ATTEMPTS: int = 3
+
+JOBS_RETRY_DELAY: int = 10
+
+JOBS_POLL_INTERVAL: float = 1
+
+JOBS_TIMEOUT: int = 600
+
+JOBS_RETENTION: int = 24 * 60 * 60
+
+DELETION_BATCH_SIZE: int = 1000
+
+TRENDING_HALF_LIFE: int = 24 * 60 * 60
+
+TRENDING_WINDOW: int = 7 * 24 * 60 * 60
+
+TRENDING_SIZE: int = 1000
+
+TRENDING_REFRESH_INTERVAL: int = 5 * 60
+
+VIEW_COUNTS_ENABLED = os.getenv('VIEW_COUNTS_ENABLED', default=True)
+
+VIEW_COUNTS_FLUSH_INTERVAL: int = 10
+
+VIEW_COUNTS_FLUSH_SIZE: int = 1000
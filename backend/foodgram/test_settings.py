@@ -0,0 +1,7 @@
+import os
+
+# The tests run on SQLite, an empty TEST_DB runs them
+# on the database of the DB_* variables, e.g. PostgreSQL.
+os.environ.setdefault('TEST_DB', 'True')
+
+from .settings import *  # noqa: E402,F401,F403
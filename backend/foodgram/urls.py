@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
@@ -6,3 +7,8 @@ urlpatterns = [
     path('api/', include('api.urls')),
     path('api/', include('users.urls')),
 ]
+
+if settings.METRICS_ENABLED:
+    from api.metrics import metrics_view
+
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.db.models import Avg, Count, Max, Min, Q
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .models import Job
+
+# Period of the finished jobs shown in the latency statistics.
+STATS_PERIOD = timedelta(hours=1)
+
+
+def queue_stats():
+    """Queue depth and latency of the last STATS_PERIOD by job name.
+    """
+    now = timezone.now()
+    stats = {}
+    for row in Job.objects.filter(
+        status__in=(Job.QUEUED, Job.RUNNING)
+    ).order_by().values('name').annotate(
+        queued=Count('id', filter=Q(status=Job.QUEUED)),
+        due=Count('id', filter=Q(status=Job.QUEUED, run_at__lte=now)),
+        running=Count('id', filter=Q(status=Job.RUNNING)),
+        oldest=Min('run_at', filter=Q(status=Job.QUEUED)),
+    ):
+        oldest = row.pop('oldest')
+        row['lag'] = max(
+            (now - oldest).total_seconds(), 0) if oldest else None
+        stats[row['name']] = row
+    for row in Job.objects.filter(
+        finished__gte=now - STATS_PERIOD
+    ).order_by().values('name').annotate(
+        done=Count('id', filter=Q(status=Job.DONE)),
+        failed=Count('id', filter=Q(status=Job.FAILED)),
+        average_wait=Avg('wait'),
+        max_wait=Max('wait'),
+        average_duration=Avg('duration'),
+        max_duration=Max('duration'),
+    ):
+        stats.setdefault(row['name'], {}).update(row)
+    return [stats[name] for name in sorted(stats)]
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'name',
+        'status',
+        'priority',
+        'attempts',
+        'created',
+        'run_at',
+        'wait',
+        'duration',
+    )
+    search_fields = ('name',)
+    list_filter = ('status', 'name')
+    readonly_fields = (
+        'name',
+        'payload',
+        'priority',
+        'status',
+        'attempts',
+        'max_attempts',
+        'created',
+        'run_at',
+        'started',
+        'finished',
+        'wait',
+        'duration',
+        'result',
+        'traceback',
+    )
+    exclude = ('error',)
+    actions = ('retry',)
+    empty_value_display = '-empty-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def traceback(self, obj):
+        """The function displays the error of the last attempt.
+        """
+        return format_html('<pre>{}</pre>', obj.error)
+
+    def retry(self, request, queryset):
+        """The function queues the selected failed jobs again.
+        """
+        retried = queryset.filter(status=Job.FAILED).update(
+            status=Job.QUEUED, attempts=0, run_at=timezone.now())
+        self.message_user(request, f'Задач поставлено в очередь: {retried}')
+
+    retry.short_description = 'Повторить выбранные задачи с ошибкой'
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {
+            **(extra_context or {}),
+            'queue_stats': queue_stats(),
+            'stats_period': int(STATS_PERIOD.total_seconds() // 60),
+        }
+        return super().changelist_view(request, extra_context)
@@ -0,0 +1,24 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Runs the queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        worker = Worker(stdout=self.stdout)
+
+        def stop(signum, frame):
+            # The current job is finished before exiting.
+            worker.stopped = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        worker.work(burst=options['burst'])
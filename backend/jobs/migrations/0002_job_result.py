@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='result',
+            field=models.TextField(blank=True, verbose_name='Результат (JSON)'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=settings.STRING_LEN_FIELD_3,
+        db_index=True,
+        verbose_name='Задача'
+    )
+    payload = models.TextField(verbose_name='Аргументы (JSON)')
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name='Приоритет'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=QUEUED,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запуск не раньше'
+    )
+    started = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начало выполнения'
+    )
+    finished = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Окончание выполнения'
+    )
+    wait = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Ожидание в очереди, мс'
+    )
+    duration = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Время выполнения, мс'
+    )
+    error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    result = models.TextField(blank=True, verbose_name='Результат (JSON)')
+
+    class Meta:
+        ordering = ('-id',)
+        indexes = (
+            models.Index(
+                fields=('status', '-priority', 'run_at'),
+                name='job_queue_idx'
+            ),
+        )
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.id}'
@@ -0,0 +1,56 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+IMMEDIATE = 'immediate'
+
+
+def job(func=None, *, priority=0, max_attempts=None):
+    """Registers a function as a background job:
+    func.delay(*args, **kwargs) enqueues a call of it.
+    The arguments must be JSON serializable, and so must the result,
+    which the workers store in Job.result.
+    """
+    def register(func):
+        func.job_name = f'{func.__module__}.{func.__qualname__}'
+        func.job_priority = priority
+        func.job_max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+        func.delay = lambda *args, **kwargs: enqueue(func, args, kwargs)
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def resolve(name):
+    func = import_string(name)
+    if getattr(func, 'job_name', None) != name:
+        raise ImportError(f'{name} is not a registered job')
+    return func
+
+
+def enqueue(func, args=(), kwargs=None, priority=None, countdown=0):
+    """Queues a call of the job func, the call is made by a worker
+    after the current transaction is committed, not earlier
+    than countdown seconds later. With JOBS_BACKEND = 'immediate'
+    the call is made in the process right after the commit.
+    """
+    payload = json.dumps({'args': list(args), 'kwargs': kwargs or {}})
+    if settings.JOBS_BACKEND == IMMEDIATE:
+        data = json.loads(payload)
+        transaction.on_commit(lambda: func(*data['args'], **data['kwargs']))
+        return None
+    return Job.objects.create(
+        name=func.job_name,
+        payload=payload,
+        priority=func.job_priority if priority is None else priority,
+        max_attempts=func.job_max_attempts,
+        run_at=timezone.now() + timedelta(seconds=countdown)
+    )
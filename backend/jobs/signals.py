@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by a worker at each iteration of its loop, like request_finished
+# at the end of a request, for the per-process state to be persisted.
+worker_iteration = Signal()
@@ -0,0 +1,130 @@
+import json
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .queue import resolve
+from .signals import worker_iteration
+
+# Number of the next jobs a worker tries to claim in one query,
+# the others may be claimed concurrently by the other workers.
+CLAIM_CANDIDATES = 10
+
+
+def milliseconds(delta):
+    return delta.total_seconds() * 1000
+
+
+class Worker:
+    """Runs the queued jobs by priority, then by run_at.
+    A job is claimed by an atomic update of its status, so any number
+    of workers may run. A failed job is retried with an exponential
+    delay until max_attempts, a job running longer than JOBS_TIMEOUT
+    is considered lost with its worker and queued again.
+    """
+
+    def __init__(self, stdout=None):
+        self.stdout = stdout
+        self.stopped = False
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def claim(self):
+        now = timezone.now()
+        candidates = Job.objects.filter(
+            status=Job.QUEUED, run_at__lte=now
+        ).order_by('-priority', 'run_at').values_list(
+            'id', flat=True)[:CLAIM_CANDIDATES]
+        for pk in candidates:
+            claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+                status=Job.RUNNING,
+                started=now,
+                attempts=F('attempts') + 1
+            )
+            if claimed:
+                return Job.objects.get(pk=pk)
+        return None
+
+    def run(self, job):
+        try:
+            func = resolve(job.name)
+            data = json.loads(job.payload)
+            result = func(*data['args'], **data['kwargs'])
+        except Exception:
+            self.failed(job, traceback.format_exc())
+        else:
+            if result is not None:
+                job.result = json.dumps(result)
+            self.finish(job, Job.DONE)
+
+    def finish(self, job, status):
+        job.status = status
+        job.finished = timezone.now()
+        job.wait = milliseconds(job.started - job.run_at)
+        job.duration = milliseconds(job.finished - job.started)
+        job.save()
+        self.log(f'{job} {status} in {job.duration:.1f}ms')
+
+    def failed(self, job, error):
+        job.error = error
+        if job.attempts >= job.max_attempts:
+            self.finish(job, Job.FAILED)
+            return
+        delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.status = Job.QUEUED
+        job.run_at = timezone.now() + timedelta(seconds=delay)
+        job.save()
+        self.log(f'{job} failed, retry in {delay}s')
+
+    def run_pending(self):
+        """Runs the jobs due until the queue is empty
+        or the worker is stopped, returns their number.
+        """
+        count = 0
+        while not self.stopped:
+            worker_iteration.send(sender=self.__class__)
+            close_old_connections()
+            job = self.claim()
+            if job is None:
+                break
+            self.run(job)
+            count += 1
+        return count
+
+    def maintain(self):
+        now = timezone.now()
+        lost = Job.objects.filter(
+            status=Job.RUNNING,
+            started__lt=now - timedelta(seconds=settings.JOBS_TIMEOUT)
+        )
+        lost.filter(attempts__lt=F('max_attempts')).update(
+            status=Job.QUEUED, run_at=now)
+        lost.update(
+            status=Job.FAILED,
+            finished=now,
+            error='Превышено время выполнения'
+        )
+        Job.objects.filter(
+            status=Job.DONE,
+            finished__lt=now - timedelta(seconds=settings.JOBS_RETENTION)
+        ).delete()
+
+    def work(self, burst=False):
+        """Runs the jobs until stopped, with burst
+        until the queue is empty.
+        """
+        while not self.stopped:
+            if self.run_pending() or self.stopped:
+                continue
+            self.maintain()
+            if burst:
+                break
+            time.sleep(settings.JOBS_POLL_INTERVAL)
@@ -0,0 +1,116 @@
+import json
+
+from django.contrib import admin
+from django.utils.html import format_html
+
+from .models import QueryFingerprint, RequestProfile, SlowQuery
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'created',
+        'user',
+        'method',
+        'path',
+        'status_code',
+        'duration',
+        'query_count',
+        'sql_duration',
+    )
+    search_fields = ('path', 'route')
+    list_filter = ('route', 'method', 'status_code')
+    exclude = ('stats', 'queries')
+    readonly_fields = (
+        'created',
+        'user',
+        'method',
+        'path',
+        'route',
+        'status_code',
+        'duration',
+        'query_count',
+        'sql_duration',
+        'profile_stats',
+        'sql_log',
+    )
+    empty_value_display = '-empty-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def profile_stats(self, obj):
+        """The function displays the cProfile statistics.
+        """
+        return format_html('<pre>{}</pre>', obj.stats)
+
+    def sql_log(self, obj):
+        """The function displays the SQL queries
+        starting from the slowest one.
+        """
+        queries = sorted(
+            json.loads(obj.queries),
+            key=lambda query: query['duration'],
+            reverse=True
+        )
+        return format_html(
+            '<pre>{}</pre>',
+            json.dumps(queries, ensure_ascii=False, indent=2)
+        )
+
+
+@admin.register(QueryFingerprint)
+class QueryFingerprintAdmin(admin.ModelAdmin):
+    list_display = (
+        'fingerprint',
+        'sql',
+        'count',
+        'total_duration',
+        'average_duration',
+        'max_duration',
+        'last_seen',
+    )
+    search_fields = ('sql',)
+    readonly_fields = (
+        'fingerprint',
+        'sql',
+        'count',
+        'total_duration',
+        'max_duration',
+        'last_seen',
+    )
+    empty_value_display = '-empty-'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'created',
+        'fingerprint',
+        'duration',
+        'sql',
+    )
+    search_fields = ('sql', 'fingerprint')
+    exclude = ('plan',)
+    readonly_fields = (
+        'created',
+        'fingerprint',
+        'sql',
+        'params',
+        'duration',
+        'query_plan',
+    )
+    empty_value_display = '-empty-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def query_plan(self, obj):
+        """The function displays the EXPLAIN output.
+        """
+        return format_html('<pre>{}</pre>', obj.plan)
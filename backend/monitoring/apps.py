@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class MonitoringConfig(AppConfig):
+    name = 'monitoring'
+
+    def ready(self):
+        if settings.SQL_LOG_ENABLED:
+            import atexit
+
+            from django.core.signals import request_finished
+            from django.db.backends.signals import connection_created
+
+            from jobs.signals import worker_iteration
+
+            from .sql import (flush_recorder, flush_recorder_at_exit,
+                              install_recorder)
+
+            connection_created.connect(install_recorder)
+            request_finished.connect(flush_recorder)
+            worker_iteration.connect(flush_recorder)
+            # The stats of the management commands, run_jobs included.
+            atexit.register(flush_recorder_at_exit)
@@ -0,0 +1,179 @@
+import base64
+import io
+import statistics
+import time
+import tracemalloc
+
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from PIL import Image
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.filters import IngredientFilter
+from api.serializers import (FollowSerializer, RecipeReadSerializer,
+                             RecipeWriteSerializer)
+from api.views import RecipeViewSet
+from recipes.models import Ingredient, Recipe, ShoppingList, Tag
+from users.models import User
+
+PAGE_SIZE = 50
+
+
+def busiest_user(queryset, field):
+    row = queryset.values(field).annotate(
+        total=Count('id')).order_by('-total').first()
+    return User.objects.get(id=row[field]) if row else User.objects.first()
+
+
+def measure(case, repeat):
+    """Runs the case repeat times and returns the median and minimal
+    wall time, the number of queries and the peak traced memory.
+    """
+    case()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case()
+        timings.append((time.perf_counter() - start) * 1000)
+    with CaptureQueriesContext(connection) as queries:
+        case()
+    tracemalloc.start()
+    try:
+        case()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'queries': len(queries),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+class BenchmarkCases:
+    """Hot serializers and endpoints measured on the current database.
+    Every method starting with case_ is a benchmark.
+    """
+
+    def __init__(self):
+        self.factory = APIRequestFactory()
+        self.cart_user = busiest_user(ShoppingList.objects, 'user')
+        self.follow_user = busiest_user(
+            User.objects.filter(follower__isnull=False), 'id')
+        self.recipes = list(Recipe.objects.all()[:PAGE_SIZE])
+        self.ingredient_ids = list(
+            Ingredient.objects.values_list('id', flat=True)[:10])
+        self.tag_ids = list(Tag.objects.values_list('id', flat=True)[:2])
+        name = Ingredient.objects.order_by('name').values_list(
+            'name', flat=True)[Ingredient.objects.count() // 2]
+        self.search = name[:2]
+        self.image = self.make_image()
+        self.edited = None
+        self.updates = 0
+
+    @staticmethod
+    def make_image():
+        content = io.BytesIO()
+        Image.new('RGB', (32, 32)).save(content, 'PNG')
+        encoded = base64.b64encode(content.getvalue()).decode()
+        return f'data:image/png;base64,{encoded}'
+
+    def request(self, user, method='get', data=None):
+        request = getattr(self.factory, method)('/', data, format='json')
+        force_authenticate(request, user=user)
+        return Request(request)
+
+    def payload(self, amount=1):
+        """Recipe data where only the first ingredient has the amount,
+        so that consecutive updates change exactly one row.
+        """
+        return {
+            'tags': self.tag_ids,
+            'ingredients': [
+                {'id': ingredient_id, 'amount': amount if index == 0 else 1}
+                for index, ingredient_id in enumerate(self.ingredient_ids)
+            ],
+            'name': 'Benchmark',
+            'image': self.image,
+            'text': 'Benchmark recipe',
+            'cooking_time': 10,
+        }
+
+    def case_recipe_read_serializer(self):
+        request = self.request(self.cart_user)
+        RecipeReadSerializer(
+            self.recipes, many=True, context={'request': request}).data
+
+    def case_follow_serializer(self):
+        request = self.request(self.follow_user)
+        authors = User.objects.filter(
+            following__user=self.follow_user)[:PAGE_SIZE]
+        FollowSerializer(
+            authors, many=True, context={'request': request}).data
+
+    def case_recipe_write_create(self):
+        request = self.request(self.cart_user, 'post')
+        serializer = RecipeWriteSerializer(
+            data=self.payload(), context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        self.edited = serializer.save()
+
+    def case_recipe_write_update(self):
+        if self.edited is None:
+            self.case_recipe_write_create()
+        request = self.request(self.cart_user, 'patch')
+        self.updates += 1
+        payload = self.payload(amount=self.updates % 100 + 1)
+        serializer = RecipeWriteSerializer(
+            self.edited, data=payload, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        self.edited = serializer.save()
+
+    def case_ingredient_prefix_search(self):
+        list(IngredientFilter(
+            {'name': self.search}, queryset=Ingredient.objects.all()).qs)
+
+    def case_download_shopping_cart(self):
+        request = self.factory.get('/')
+        force_authenticate(request, user=self.cart_user)
+        view = RecipeViewSet.as_view({'get': 'download_shopping_cart'})
+        view(request)
+
+    def run(self, repeat):
+        return {
+            name[len('case_'):]: measure(getattr(self, name), repeat)
+            for name in sorted(dir(self)) if name.startswith('case_')
+        }
+
+
+def compare(results, baseline, threshold, min_delta_ms=2.0):
+    """Returns the list of regressions of results against the baseline.
+    Time and memory regress when they grow by more than threshold
+    (and time by more than min_delta_ms), the number of queries
+    regresses when it grows at all.
+    """
+    regressions = []
+    for size, cases in results.items():
+        for case, metrics in cases.items():
+            expected = baseline.get(size, {}).get(case)
+            if expected is None:
+                continue
+            for metric, min_delta in (('median_ms', min_delta_ms),
+                                      ('peak_kb', 0)):
+                limit = max(
+                    expected[metric] * (1 + threshold),
+                    expected[metric] + min_delta
+                )
+                if metrics[metric] > limit:
+                    regressions.append(
+                        f'{size}/{case}: {metric} {metrics[metric]} '
+                        f'> {expected[metric]} (+{threshold:.0%})')
+            if metrics['queries'] > expected['queries']:
+                regressions.append(
+                    f'{size}/{case}: queries {metrics["queries"]} '
+                    f'> {expected["queries"]}')
+    return regressions
@@ -0,0 +1,195 @@
+import random
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+from recipes.models import Ingredient, Recipe, Tag
+
+# Share of every scenario in the traffic mix.
+SCENARIOS = {
+    'feed': 35,
+    'tag_filter': 15,
+    'ingredient_autocomplete': 20,
+    'favorite_toggle': 8,
+    'shopping_cart_toggle': 8,
+    'download_shopping_cart': 4,
+    'subscriptions': 10,
+}
+AUTHENTICATED = {
+    'favorite_toggle',
+    'shopping_cart_toggle',
+    'download_shopping_cart',
+    'subscriptions',
+}
+
+
+def percentile(values, share):
+    """Nearest-rank percentile of sorted values.
+    """
+    if not values:
+        return 0
+    index = max(int(round(share * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class LoadTest:
+    """Runs the traffic mix against a running server
+    from several threads for a fixed duration. A request failing
+    or not answered in timeout seconds counts as an error.
+    """
+
+    def __init__(self, url, users, password, concurrency, duration, seed,
+                 timeout=10):
+        self.url = url.rstrip('/')
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.recipe_ids = list(
+            Recipe.objects.values_list('id', flat=True)[:10000])
+        self.tags = list(Tag.objects.values_list('slug', flat=True))
+        self.prefixes = sorted({
+            name[:2] for name in Ingredient.objects.values_list(
+                'name', flat=True)
+        })
+        self.pages = max(len(self.recipe_ids) // 6, 1)
+        self.tokens = self.login(users, password)
+
+    def login(self, users, password):
+        tokens = []
+        for email in users:
+            response = requests.post(
+                f'{self.url}/api/auth/token/login/',
+                json={'email': email, 'password': password},
+                timeout=self.timeout,
+            )
+            if response.ok:
+                tokens.append(response.json()['auth_token'])
+        return tokens
+
+    def record(self, name, start, response):
+        duration = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.samples[name].append(duration)
+            if response is None or response.status_code >= 400:
+                self.errors[name] += 1
+
+    def request(self, session, name, method, path, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = session.request(
+                method, f'{self.url}{path}', timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            response = None
+        self.record(name, start, response)
+
+    def feed(self, session, rng):
+        page = rng.randint(1, min(self.pages, 50))
+        self.request(session, 'feed', 'GET', f'/api/recipes/?page={page}')
+
+    def tag_filter(self, session, rng):
+        tags = rng.sample(self.tags, min(rng.randint(1, 2), len(self.tags)))
+        self.request(
+            session, 'tag_filter', 'GET', '/api/recipes/',
+            params={'tags': tags})
+
+    def ingredient_autocomplete(self, session, rng):
+        self.request(
+            session, 'ingredient_autocomplete', 'GET', '/api/ingredients/',
+            params={'name': rng.choice(self.prefixes)})
+
+    def toggle(self, session, rng, name, path):
+        recipe_id = rng.choice(self.recipe_ids)
+        url = f'/api/recipes/{recipe_id}/{path}/'
+        self.request(session, name, 'POST', url)
+        self.request(session, name, 'DELETE', url)
+
+    def favorite_toggle(self, session, rng):
+        self.toggle(session, rng, 'favorite_toggle', 'favorite')
+
+    def shopping_cart_toggle(self, session, rng):
+        self.toggle(session, rng, 'shopping_cart_toggle', 'shopping_cart')
+
+    def download_shopping_cart(self, session, rng):
+        self.request(
+            session, 'download_shopping_cart', 'GET',
+            '/api/recipes/download_shopping_cart/')
+
+    def subscriptions(self, session, rng):
+        self.request(
+            session, 'subscriptions', 'GET', '/api/users/subscriptions/')
+
+    def worker(self, index, deadline):
+        rng = random.Random(f'{self.seed}-{index}')
+        session = requests.Session()
+        token = self.tokens[index % len(self.tokens)] if self.tokens else None
+        names = [
+            name for name in SCENARIOS
+            if token is not None or name not in AUTHENTICATED
+        ]
+        weights = [SCENARIOS[name] for name in names]
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            if name in AUTHENTICATED:
+                session.headers['Authorization'] = f'Token {token}'
+            else:
+                session.headers.pop('Authorization', None)
+            getattr(self, name)(session, rng)
+
+    def run(self):
+        deadline = time.monotonic() + self.duration
+        threads = [
+            threading.Thread(target=self.worker, args=(index, deadline))
+            for index in range(self.concurrency)
+        ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            samples.sort()
+            endpoints[name] = {
+                'requests': len(samples),
+                'errors': self.errors[name],
+                'rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(samples, 0.5), 2),
+                'p95_ms': round(percentile(samples, 0.95), 2),
+                'p99_ms': round(percentile(samples, 0.99), 2),
+            }
+        total = sum(item['requests'] for item in endpoints.values())
+        return {
+            'concurrency': self.concurrency,
+            'duration_s': round(elapsed, 2),
+            'requests': total,
+            'rps': round(total / elapsed, 2),
+            'endpoints': endpoints,
+        }
+
+
+def compare(report, previous):
+    """Returns lines comparing the throughput and the p95 latency
+    of every endpoint with the previous report.
+    """
+    lines = [
+        f'total rps: {previous["rps"]} -> {report["rps"]}'
+    ]
+    for name, current in report['endpoints'].items():
+        before = previous['endpoints'].get(name)
+        if before is None:
+            continue
+        lines.append(
+            f'{name}: rps {before["rps"]} -> {current["rps"]}, '
+            f'p95 {before["p95_ms"]} -> {current["p95_ms"]} ms'
+        )
+    return lines
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from monitoring.benchmarks import BenchmarkCases, compare
+
+BASELINE = os.path.join(
+    settings.BASE_DIR, 'monitoring', 'benchmark_baseline.json')
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks hot serializers and endpoints on a test database '
+            'and compares the results with the stored baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=str, default='100,1000',
+                            help='Comma separated numbers of recipes')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', type=str,
+                            help='File to write the results to')
+        parser.add_argument('--baseline', type=str, default=BASELINE)
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed relative growth of time and memory')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Time growth always allowed, in ms')
+        parser.add_argument('--update-baseline', action='store_true')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        results = {
+            str(size): self.run_size(size, options['repeat'])
+            for size in sizes
+        }
+        output = json.dumps(results, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+        baseline = {}
+        if os.path.exists(options['baseline']):
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+        if options['update_baseline']:
+            baseline.setdefault(connection.vendor, {}).update(results)
+            with open(options['baseline'], 'w') as f:
+                f.write(json.dumps(baseline, indent=2, sort_keys=True))
+                f.write('\n')
+            return
+        regressions = compare(
+            results, baseline.get(connection.vendor, {}),
+            options['threshold'], options['min_delta_ms'])
+        if regressions:
+            raise CommandError(
+                'Regressions found:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions found'))
+
+    def run_size(self, size, repeat):
+        """Creates a test database with the synthetic dataset
+        of the given size and runs the benchmarks on it.
+        """
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media_root:
+                with override_settings(MEDIA_ROOT=media_root, DEBUG=False):
+                    call_command(
+                        'generate_data',
+                        users=max(size // 10, 2),
+                        recipes=size,
+                        seed=0,
+                        stdout=StringIO()
+                    )
+                    return BenchmarkCases().run(repeat)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,114 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from recipes.models import (FavoriteRecipes, Follow, Recipe, RecipeIngredients,
+                            ShoppingList)
+from users.models import User
+
+# Ids the plans are built for. No user or tag has the id 0, so the plans
+# are the ones of an ordinary user or tag, not of the most frequent ones.
+USER_ID = 0
+TAG_ID = 0
+IDS = [1, 2, 3]
+PAGE = 6
+
+# Query shapes of the feed, the filters and the serializers
+# with the indexes their plans must use.
+PLAN_CASES = {
+    'feed': (
+        lambda: Recipe.objects.all()[:PAGE],
+        ('recipe_pub_date_idx',),
+    ),
+    'author feed': (
+        lambda: Recipe.objects.filter(author_id=USER_ID)[:PAGE],
+        ('recipe_author_pub_date_idx',),
+    ),
+    'favorites feed': (
+        lambda: Recipe.objects.filter(favorites__user=USER_ID)[:PAGE],
+        ('unique_favorite_recipe',),
+    ),
+    'shopping cart feed': (
+        lambda: Recipe.objects.filter(shopping_list__user=USER_ID)[:PAGE],
+        ('unique_shopping_list_recipe',),
+    ),
+    'trending feed': (
+        lambda: Recipe.objects.filter(
+            trending__isnull=False
+        ).order_by('-trending__score', '-id')[:PAGE],
+        ('trending_score_idx',),
+    ),
+    'tags feed': (
+        lambda: Recipe.objects.filter(tags=TAG_ID)[:PAGE],
+        ('recipes_recipe_tags_tag_id',),
+    ),
+    'is favorited': (
+        lambda: FavoriteRecipes.objects.filter(
+            user=USER_ID, recipe_id__in=IDS),
+        ('unique_favorite_recipe',),
+    ),
+    'is in shopping cart': (
+        lambda: ShoppingList.objects.filter(
+            user=USER_ID, recipe_id__in=IDS),
+        ('unique_shopping_list_recipe',),
+    ),
+    'subscriptions': (
+        lambda: User.objects.filter(following__user=USER_ID)[:PAGE],
+        ('unique_subscriptions',),
+    ),
+    'is subscribed': (
+        lambda: Follow.objects.filter(user=USER_ID, author_id__in=IDS),
+        ('unique_subscriptions',),
+    ),
+    'recipe ingredients': (
+        lambda: RecipeIngredients.objects.filter(recipe_id__in=IDS),
+        ('all_keys_unique_together',),
+    ),
+    'shopping cart download': (
+        lambda: RecipeIngredients.objects.filter(
+            recipe__shopping_list__user=USER_ID,
+            recipe__is_deleted=False
+        ).values('ingredient__name', 'ingredient__measurement_unit').annotate(
+            amount=Sum('amount')),
+        ('unique_shopping_list_recipe', 'all_keys_unique_together'),
+    ),
+}
+
+
+def query_plan(build):
+    """Plan of the query of a PLAN_CASES entry.
+    """
+    with transaction.atomic():
+        # Checks that the index can serve the query whatever
+        # the size of the tables, as on a production database.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        return build().explain()
+
+
+class Command(BaseCommand):
+    help = ('Checks that the query plans of the feed and the filters '
+            'use the expected indexes, on PostgreSQL only')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plans', action='store_true',
+                            help='Print the plans')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write('Skipped: the plans are checked on PostgreSQL')
+            return
+        failed = []
+        for name, (build, indexes) in PLAN_CASES.items():
+            plan = query_plan(build)
+            missing = [index for index in indexes if index not in plan]
+            if missing:
+                failed.append(name)
+            status = f'MISSING {", ".join(missing)}' if missing else 'ok'
+            self.stdout.write(f'{name}: {status}')
+            if options['plans'] or missing:
+                for line in plan.splitlines():
+                    self.stdout.write(f'    | {line}')
+        if failed:
+            raise CommandError(
+                f'Plans without the expected indexes: {", ".join(failed)}')
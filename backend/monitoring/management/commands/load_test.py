@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+import requests
+
+from monitoring.loadtest import LoadTest, compare
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Runs the HTTP traffic mix against the server '
+            'and reports throughput and latency percentiles per endpoint')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', type=str,
+                            default='http://127.0.0.1:8000')
+        parser.add_argument('--duration', type=int, default=60,
+                            help='Duration of the test in seconds')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--timeout', type=float, default=10,
+                            help='Seconds before a request counts '
+                                 'as an error')
+        parser.add_argument('--password', type=str,
+                            default='synthetic-password',
+                            help='Password of the generate_data users')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', type=str,
+                            help='File to write the report to')
+        parser.add_argument('--compare', type=str,
+                            help='Previous report to compare with')
+        parser.add_argument('--start-server', action='store_true',
+                            help='Start gunicorn on --url for the test')
+        parser.add_argument('--gunicorn-workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        users = list(User.objects.filter(
+            username__startswith='synthetic_'
+        ).values_list('email', flat=True)[:options['concurrency']])
+        server = None
+        if options['start_server']:
+            server = self.start_server(
+                options['url'], options['gunicorn_workers'])
+        try:
+            report = LoadTest(
+                url=options['url'],
+                users=users,
+                password=options['password'],
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                seed=options['seed'],
+                timeout=options['timeout'],
+            ).run()
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        output = json.dumps(report, indent=2, sort_keys=True)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        if options['compare']:
+            with open(options['compare']) as f:
+                for line in compare(report, json.load(f)):
+                    self.stdout.write(line)
+
+    def start_server(self, url, workers):
+        bind = url.split('://', 1)[-1].rstrip('/')
+        server = subprocess.Popen(
+            ['gunicorn', 'foodgram.wsgi:application',
+             '--config', 'gunicorn.conf.py', '--bind', bind,
+             '--workers', str(workers)],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+        )
+        for _ in range(100):
+            try:
+                requests.get(f'{url}/api/tags/', timeout=1)
+                return server
+            except requests.RequestException:
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError('The server did not start')
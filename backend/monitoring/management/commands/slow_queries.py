@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from monitoring.models import QueryFingerprint, SlowQuery
+
+ORDERING = {
+    'total': '-total_duration',
+    'count': '-count',
+    'max': '-max_duration',
+}
+
+
+class Command(BaseCommand):
+    help = 'Prints the SQL queries with the largest total, count or max time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--order-by', choices=ORDERING, default='total')
+        parser.add_argument('--plans', action='store_true',
+                            help='Print the latest plan of a slow query')
+        parser.add_argument('--reset', action='store_true',
+                            help='Delete the collected statistics')
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            QueryFingerprint.objects.all().delete()
+            SlowQuery.objects.all().delete()
+            return
+        offenders = QueryFingerprint.objects.order_by(
+            ORDERING[options['order_by']])[:options['limit']]
+        for item in offenders:
+            self.stdout.write(
+                f'{item.fingerprint}  count={item.count}  '
+                f'total={item.total_duration:.1f}ms  '
+                f'avg={item.average_duration:.2f}ms  '
+                f'max={item.max_duration:.1f}ms'
+            )
+            self.stdout.write(f'    {item.sql}')
+            if not options['plans']:
+                continue
+            slow = SlowQuery.objects.filter(
+                fingerprint=item.fingerprint).first()
+            if slow is not None and slow.plan:
+                for line in slow.plan.splitlines():
+                    self.stdout.write(f'    | {line}')
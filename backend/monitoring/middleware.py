@@ -0,0 +1,95 @@
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .models import RequestProfile
+from .sql import QueryLog, explain
+
+
+def get_staff_user(request):
+    """Returns the staff user making the request.
+    API requests are authenticated by the DRF authentication classes,
+    which are only run here for requests asking to be profiled.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user if user.is_staff else None
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except APIException:
+            return None
+        if result is not None:
+            return result[0] if result[0].is_staff else None
+    return None
+
+
+class ProfilerMiddleware:
+    """Profiles the requests of staff users sent with the X-Profile header
+    or the ?profile query parameter and stores the cProfile statistics
+    and the SQL log in RequestProfile. Other requests are passed through.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (settings.PROFILER_HEADER not in request.META
+                and settings.PROFILER_QUERY_PARAM not in request.GET):
+            return self.get_response(request)
+        user = get_staff_user(request)
+        if user is None:
+            return self.get_response(request)
+        return self.profile(request, user)
+
+    def profile(self, request, user):
+        logs = [QueryLog(connection.alias) for connection in connections.all()]
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection, log in zip(connections.all(), logs):
+                stack.enter_context(connection.execute_wrapper(log))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = (time.perf_counter() - start) * 1000
+
+        queries = [query for log in logs for query in log.queries]
+        slowest = sorted(
+            queries, key=lambda query: query['duration'], reverse=True
+        )[:settings.PROFILER_EXPLAIN_TOP]
+        for query in slowest:
+            query['explain'] = explain(
+                query['alias'], query['sql'], query['params'])
+
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(
+            'cumulative').print_stats(settings.PROFILER_STATS_LIMIT)
+        match = request.resolver_match
+        profile = RequestProfile.objects.create(
+            user=user,
+            method=request.method,
+            path=request.get_full_path(),
+            route=(match.url_name or '') if match else '',
+            status_code=response.status_code,
+            duration=duration,
+            query_count=len(queries),
+            sql_duration=sum(query['duration'] for query in queries),
+            stats=stream.getvalue(),
+            queries=json.dumps(queries, ensure_ascii=False, default=str),
+        )
+        response['X-Profile-Id'] = profile.id
+        return response
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата профилирования')),
+                ('method', models.CharField(max_length=7, verbose_name='HTTP метод')),
+                ('path', models.TextField(verbose_name='Путь запроса')),
+                ('route', models.CharField(max_length=200, verbose_name='Маршрут')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Код ответа')),
+                ('duration', models.FloatField(verbose_name='Время запроса, мс')),
+                ('query_count', models.PositiveIntegerField(verbose_name='Количество SQL запросов')),
+                ('sql_duration', models.FloatField(verbose_name='Время SQL запросов, мс')),
+                ('stats', models.TextField(verbose_name='Профиль cProfile')),
+                ('queries', models.TextField(verbose_name='SQL запросы (JSON)')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Профиль запроса',
+                'verbose_name_plural': 'Профили запросов',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryFingerprint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=32, unique=True, verbose_name='Отпечаток запроса')),
+                ('sql', models.TextField(verbose_name='Нормализованный запрос')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество выполнений')),
+                ('total_duration', models.FloatField(default=0, verbose_name='Общее время, мс')),
+                ('max_duration', models.FloatField(default=0, verbose_name='Максимальное время, мс')),
+                ('last_seen', models.DateTimeField(verbose_name='Последнее выполнение')),
+            ],
+            options={
+                'verbose_name': 'Отпечаток SQL запроса',
+                'verbose_name_plural': 'Отпечатки SQL запросов',
+                'ordering': ('-total_duration',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата выполнения')),
+                ('fingerprint', models.CharField(db_index=True, max_length=32, verbose_name='Отпечаток запроса')),
+                ('sql', models.TextField(verbose_name='SQL запрос')),
+                ('params', models.TextField(verbose_name='Параметры запроса')),
+                ('duration', models.FloatField(verbose_name='Время выполнения, мс')),
+                ('plan', models.TextField(blank=True, verbose_name='План запроса')),
+            ],
+            options={
+                'verbose_name': 'Медленный SQL запрос',
+                'verbose_name_plural': 'Медленные SQL запросы',
+                'ordering': ('-id',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0002_query_log'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestprofile',
+            name='method',
+            field=models.CharField(max_length=10, verbose_name='HTTP метод'),
+        ),
+    ]
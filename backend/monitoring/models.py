@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db import models
+
+from users.models import User
+
+
+class RequestProfile(models.Model):
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата профилирования'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='request_profiles',
+        verbose_name='Пользователь'
+    )
+    method = models.CharField(
+        max_length=settings.HTTP_METHOD_LEN,
+        verbose_name='HTTP метод'
+    )
+    path = models.TextField(verbose_name='Путь запроса')
+    route = models.CharField(
+        max_length=settings.STRING_LEN_FIELD_3,
+        verbose_name='Маршрут'
+    )
+    status_code = models.PositiveSmallIntegerField(
+        verbose_name='Код ответа'
+    )
+    duration = models.FloatField(verbose_name='Время запроса, мс')
+    query_count = models.PositiveIntegerField(
+        verbose_name='Количество SQL запросов'
+    )
+    sql_duration = models.FloatField(verbose_name='Время SQL запросов, мс')
+    stats = models.TextField(verbose_name='Профиль cProfile')
+    queries = models.TextField(verbose_name='SQL запросы (JSON)')
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Профиль запроса'
+        verbose_name_plural = 'Профили запросов'
+
+    def __str__(self):
+        return f'{self.method} {self.path}'[:settings.STRING_LEN]
+
+
+class QueryFingerprint(models.Model):
+    fingerprint = models.CharField(
+        max_length=32,
+        unique=True,
+        verbose_name='Отпечаток запроса'
+    )
+    sql = models.TextField(verbose_name='Нормализованный запрос')
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество выполнений'
+    )
+    total_duration = models.FloatField(
+        default=0,
+        verbose_name='Общее время, мс'
+    )
+    max_duration = models.FloatField(
+        default=0,
+        verbose_name='Максимальное время, мс'
+    )
+    last_seen = models.DateTimeField(verbose_name='Последнее выполнение')
+
+    class Meta:
+        ordering = ('-total_duration',)
+        verbose_name = 'Отпечаток SQL запроса'
+        verbose_name_plural = 'Отпечатки SQL запросов'
+
+    def __str__(self):
+        return self.sql[:settings.STRING_LEN]
+
+    @property
+    def average_duration(self):
+        return self.total_duration / self.count if self.count else 0
+
+
+class SlowQuery(models.Model):
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата выполнения'
+    )
+    fingerprint = models.CharField(
+        max_length=32,
+        db_index=True,
+        verbose_name='Отпечаток запроса'
+    )
+    sql = models.TextField(verbose_name='SQL запрос')
+    params = models.TextField(verbose_name='Параметры запроса')
+    duration = models.FloatField(verbose_name='Время выполнения, мс')
+    plan = models.TextField(blank=True, verbose_name='План запроса')
+
+    class Meta:
+        ordering = ('-id',)
+        verbose_name = 'Медленный SQL запрос'
+        verbose_name_plural = 'Медленные SQL запросы'
+
+    def __str__(self):
+        return self.sql[:settings.STRING_LEN]
@@ -0,0 +1,213 @@
+import hashlib
+import re
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+NORMALIZE_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Replaces literals, parameters and IN lists of the query with
+    placeholders and returns the hash and the normalized query.
+    """
+    normalized = sql
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = normalized.strip()
+    return hashlib.md5(normalized.encode()).hexdigest(), normalized
+
+
+class QueryLog:
+    """Database execute wrapper keeping every query
+    with its parameters and duration.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': self.alias,
+                'sql': sql,
+                'params': None if many else params,
+                'duration': (time.perf_counter() - start) * 1000,
+            })
+
+
+def explain(alias, sql, params, analyze=False):
+    """Returns the query plan of a SELECT query as a list of rows.
+    """
+    connection = connections[alias]
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    if analyze and connection.vendor == 'postgresql':
+        prefix = 'EXPLAIN ANALYZE '
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [
+                ' '.join(str(column) for column in row)
+                for row in cursor.fetchall()
+            ]
+    except DatabaseError as error:
+        return [f'EXPLAIN failed: {error}']
+
+
+class QueryRecorder:
+    """Database execute wrapper aggregating the count and the duration
+    of the queries to the tables of SQL_LOG_APPS per fingerprint.
+    Queries slower than SLOW_QUERY_THRESHOLD are kept with their
+    parameters to be explained on the next flush.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}
+        self.slow = []
+        self.last_flush = time.monotonic()
+        # The table names quoted in any way or not quoted at all.
+        self.tables = re.compile(r'\b(?:{})_\w'.format(
+            '|'.join(map(re.escape, settings.SQL_LOG_APPS))))
+
+    def __call__(self, execute, sql, params, many, context):
+        if (getattr(self.local, 'paused', False)
+                or not self.tables.search(sql)):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(
+                context['connection'].alias,
+                sql,
+                None if many else params,
+                (time.perf_counter() - start) * 1000
+            )
+
+    def record(self, alias, sql, params, duration):
+        key, normalized = fingerprint(sql)
+        with self.lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = [normalized, 0, 0.0, 0.0]
+            entry[1] += 1
+            entry[2] += duration
+            entry[3] = max(entry[3], duration)
+            if (duration >= settings.SLOW_QUERY_THRESHOLD
+                    and len(self.slow) < settings.SLOW_QUERY_LOG_SIZE):
+                self.slow.append((key, alias, sql, params, duration))
+
+    def flush(self, force=False):
+        """Writes the collected statistics and the slow queries
+        to the database. Statistics are written once per
+        SQL_LOG_FLUSH_INTERVAL seconds unless forced.
+        """
+        due = (time.monotonic() - self.last_flush
+               >= settings.SQL_LOG_FLUSH_INTERVAL)
+        with self.lock:
+            if not (force or due or self.slow):
+                return
+            slow, self.slow = self.slow, []
+            if force or due:
+                stats, self.stats = self.stats, {}
+                self.last_flush = time.monotonic()
+            else:
+                stats = {}
+        self.local.paused = True
+        try:
+            self.save_stats(stats)
+            self.save_slow(slow)
+        finally:
+            self.local.paused = False
+
+    def save_stats(self, stats):
+        from .models import QueryFingerprint
+
+        now = timezone.now()
+        for key, (normalized, count, total, longest) in stats.items():
+            changes = {
+                'count': F('count') + count,
+                'total_duration': F('total_duration') + total,
+                'max_duration': Greatest('max_duration', longest),
+                'last_seen': now,
+            }
+            queryset = QueryFingerprint.objects.filter(fingerprint=key)
+            if queryset.update(**changes):
+                continue
+            try:
+                with transaction.atomic():
+                    QueryFingerprint.objects.create(
+                        fingerprint=key,
+                        sql=normalized,
+                        count=count,
+                        total_duration=total,
+                        max_duration=longest,
+                        last_seen=now,
+                    )
+            except IntegrityError:
+                queryset.update(**changes)
+
+    def save_slow(self, slow):
+        from .models import SlowQuery
+
+        if not slow:
+            return
+        SlowQuery.objects.bulk_create([
+            SlowQuery(
+                fingerprint=key,
+                sql=sql,
+                params=repr(params),
+                duration=duration,
+                plan='\n'.join(explain(
+                    alias, sql, params,
+                    analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE
+                ) or []),
+            ) for key, alias, sql, params, duration in slow
+        ])
+        oldest = SlowQuery.objects.order_by('-id').values_list(
+            'id', flat=True)[settings.SLOW_QUERY_LOG_SIZE:][:1]
+        if oldest:
+            SlowQuery.objects.filter(id__lte=oldest[0]).delete()
+
+
+recorder = QueryRecorder()
+
+
+def install_recorder(sender, connection, **kwargs):
+    if recorder not in connection.execute_wrappers:
+        connection.execute_wrappers.append(recorder)
+
+
+def flush_recorder(sender, **kwargs):
+    recorder.flush()
+
+
+def flush_recorder_at_exit():
+    recorder.flush(force=True)
@@ -1,7 +1,9 @@
 from django.contrib import admin
 
+from .deletion import delete_recipe
 from .models import (FavoriteRecipes, Follow, Ingredient, Recipe,
-                     RecipeIngredients, RecipeTags, ShoppingList, Tag)
+                     RecipeIngredients, RecipeTags, ShoppingList, Tag,
+                     TrendingRecipe)
 
 
 @admin.register(Tag)
@@ -51,6 +53,7 @@ class RecipeAdmin(admin.ModelAdmin):
         'text',
         'cooking_time',
         'pub_date',
+        'views',
         'in_favorites',
         'all_ingredients',
         'all_tags'
@@ -58,8 +61,17 @@ class RecipeAdmin(admin.ModelAdmin):
     search_fields = ('name', 'author', 'pub_date')
     list_filter = ('name', 'author', 'pub_date', 'tags')
     inlines = (RecipeIngredientsAdmin, RecipeTagsAdmin)
+    # Written by the count_views jobs only.
+    readonly_fields = ('views',)
     empty_value_display = '-empty-'
 
+    def delete_model(self, request, obj):
+        delete_recipe(obj)
+
+    def delete_queryset(self, request, queryset):
+        for recipe in queryset:
+            delete_recipe(recipe)
+
     def in_favorites(self, obj):
         """The function counts total number
         of added recipes to favorites.
@@ -87,6 +99,7 @@ class FavoriteRecipesAdmin(admin.ModelAdmin):
     list_display = (
         'recipe',
         'user',
+        'created',
     )
     search_fields = ('user',)
     list_filter = ('user',)
@@ -98,6 +111,7 @@ class ShoppingListAdmin(admin.ModelAdmin):
     list_display = (
         'recipe',
         'user',
+        'created',
     )
     search_fields = ('user',)
     list_filter = ('user',)
@@ -113,3 +127,16 @@ class FollowAdmin(admin.ModelAdmin):
     search_fields = ('user', 'author',)
     list_filter = ('user',)
     empty_value_display = '-empty-'
+
+
+@admin.register(TrendingRecipe)
+class TrendingRecipeAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipe',
+        'score',
+    )
+    readonly_fields = ('recipe', 'score')
+    empty_value_display = '-empty-'
+
+    def has_add_permission(self, request):
+        return False
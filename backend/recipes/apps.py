@@ -1,5 +1,28 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
 
 
 class RecipesConfig(AppConfig):
     name = 'recipes'
+
+    def ready(self):
+        from .models import Recipe, Tag
+        from .signals import (feed_changed, image_replaced, recipe_created,
+                              recipe_deleted, recipe_tags_changed,
+                              remember_image)
+
+        post_init.connect(remember_image, sender=Recipe)
+        post_save.connect(image_replaced, sender=Recipe)
+        post_delete.connect(recipe_deleted, sender=Recipe)
+        post_save.connect(recipe_created, sender=Recipe)
+        post_delete.connect(feed_changed, sender=Recipe)
+        m2m_changed.connect(recipe_tags_changed, sender=Recipe.tags.through)
+        post_save.connect(feed_changed, sender=Tag)
+        post_delete.connect(feed_changed, sender=Tag)
+        if settings.VIEW_COUNTS_ENABLED:
+            from .counters import flush_views
+
+            request_finished.connect(flush_views)
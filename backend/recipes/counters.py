@@ -0,0 +1,59 @@
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from .jobs import count_views
+
+
+class ViewCounter:
+    """Recipe views counted in the process memory. The counts are
+    written by a count_views job once VIEW_COUNTS_FLUSH_INTERVAL seconds
+    have passed or VIEW_COUNTS_FLUSH_SIZE recipes were viewed, so a killed
+    process loses at most that many views. The interval is also checked
+    at the end of every request, so that the views of a recipe are
+    written even if no other recipe is viewed after them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.flushed = time.monotonic()
+
+    def due(self):
+        return (
+            len(self.counts) >= settings.VIEW_COUNTS_FLUSH_SIZE
+            or time.monotonic() - self.flushed
+            >= settings.VIEW_COUNTS_FLUSH_INTERVAL
+        )
+
+    def add(self, recipe_id):
+        with self.lock:
+            self.counts[recipe_id] += 1
+            due = self.due()
+        if due:
+            self.flush()
+
+    def flush_due(self):
+        with self.lock:
+            due = bool(self.counts) and self.due()
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.flushed = time.monotonic()
+        if counts:
+            count_views.delay(dict(counts))
+
+
+view_counter = ViewCounter()
+# A stopped worker writes the views it has not flushed yet.
+atexit.register(view_counter.flush)
+
+
+def flush_views(sender, **kwargs):
+    view_counter.flush_due()
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import transaction
+
+from jobs.queue import job
+from users.models import User
+
+from .feed import invalidate_feed
+from .models import (FavoriteRecipes, Follow, Recipe, RecipeIngredients,
+                     RecipeTags, ShoppingList, TrendingRecipe)
+
+RECIPE_DEPENDENTS = (
+    RecipeIngredients,
+    RecipeTags,
+    Recipe.tags.through,
+    FavoriteRecipes,
+    ShoppingList,
+    TrendingRecipe,
+)
+
+
+def delete_in_batches(queryset):
+    """Deletes the rows of the queryset by DELETION_BATCH_SIZE,
+    every batch in its own short transaction. The rows without
+    dependents and delete signals are deleted without loading them.
+    """
+    while True:
+        pks = list(queryset.order_by().values_list(
+            'pk', flat=True)[:settings.DELETION_BATCH_SIZE])
+        if not pks:
+            return
+        queryset.model._base_manager.filter(pk__in=pks).delete()
+
+
+def purge_recipes(recipes):
+    """Deletes the recipes after their dependents, so that the batches
+    of recipes loaded for the delete signals have nothing to cascade.
+    """
+    for model in RECIPE_DEPENDENTS:
+        delete_in_batches(model.objects.filter(recipe__in=recipes))
+    delete_in_batches(recipes)
+
+
+@job(priority=-1)
+def purge_recipe(recipe_id):
+    purge_recipes(Recipe.all_objects.filter(pk=recipe_id))
+
+
+@job(priority=-1)
+def purge_user(user_id):
+    purge_recipes(Recipe.all_objects.filter(author_id=user_id))
+    delete_in_batches(Follow.objects.filter(user_id=user_id))
+    delete_in_batches(Follow.objects.filter(author_id=user_id))
+    delete_in_batches(FavoriteRecipes.objects.filter(user_id=user_id))
+    delete_in_batches(ShoppingList.objects.filter(user_id=user_id))
+    User.objects.filter(pk=user_id).delete()
+
+
+@transaction.atomic
+def delete_recipe(recipe):
+    """Hides the recipe at once, it is deleted with its dependents
+    in batches by a background job.
+    """
+    Recipe.all_objects.filter(pk=recipe.pk).update(is_deleted=True)
+    invalidate_feed()
+    purge_recipe.delay(recipe.pk)
+
+
+@transaction.atomic
+def delete_user(user):
+    """Deactivates the user and hides their recipes at once,
+    they are deleted with the dependents in batches by a background job.
+    """
+    user.is_active = False
+    user.save(update_fields=('is_active',))
+    Recipe.all_objects.filter(author=user).update(is_deleted=True)
+    invalidate_feed()
+    purge_user.delay(user.pk)
@@ -0,0 +1,25 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+FEED_VERSION_KEY = 'feed:version'
+
+
+def feed_version():
+    """Version of the cached feed id lists, shared by the processes
+    through the cache.
+    """
+    version = cache.get(FEED_VERSION_KEY)
+    if version is None:
+        cache.add(FEED_VERSION_KEY, uuid4().hex, None)
+        return cache.get(FEED_VERSION_KEY)
+    return version
+
+
+def invalidate_feed():
+    """Makes all the cached feed id lists stale once the transaction
+    is committed, so that no request caches the data before the commit.
+    """
+    transaction.on_commit(
+        lambda: cache.set(FEED_VERSION_KEY, uuid4().hex, None))
@@ -0,0 +1,48 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from jobs.queue import IMMEDIATE, enqueue, job
+
+from .models import Recipe
+
+
+@job(priority=-1)
+def release_image(name):
+    """Deletes the image file once no recipe references it.
+    The release of a file stored or reused within IMAGE_RELEASE_GRACE
+    is postponed, the recipe reusing it may not be committed yet.
+    With immediate jobs such a file is left to cleanup_images.
+    """
+    if not name or not default_storage.exists(name):
+        return
+    grace = settings.IMAGE_RELEASE_GRACE
+    if (default_storage.get_modified_time(name)
+            > timezone.now() - timedelta(seconds=grace)):
+        if settings.JOBS_BACKEND != IMMEDIATE:
+            enqueue(release_image, (name,), countdown=grace)
+        return
+    if not Recipe.all_objects.filter(image=name).exists():
+        default_storage.delete(name)
+
+
+@job
+def count_views(counts):
+    """Adds the views counted by a process to the recipes
+    in one UPDATE, the recipes grouped by their number of views.
+    """
+    recipes = defaultdict(list)
+    for recipe_id, views in counts.items():
+        recipes[views].append(int(recipe_id))
+    Recipe.all_objects.filter(pk__in=map(int, counts)).update(
+        views=F('views') + Case(
+            *(When(pk__in=ids, then=Value(views))
+              for views, ids in recipes.items()),
+            default=Value(0),
+            output_field=PositiveIntegerField()
+        )
+    )
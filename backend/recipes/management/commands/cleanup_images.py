@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from recipes.models import Recipe
+
+# Recipe images and the direct uploads never claimed by a recipe.
+IMAGE_ROOTS = ('recipes', 'uploads')
+
+
+def walk(storage, path):
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield f'{path}/{name}'
+    for directory in directories:
+        yield from walk(storage, f'{path}/{directory}')
+
+
+class Command(BaseCommand):
+    help = ('Deletes the recipe images not referenced by any recipe '
+            'and the abandoned direct uploads')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-age', type=int, default=60,
+                            help='Keep the files younger than this many '
+                                 'minutes, they may belong to an unsaved '
+                                 'recipe')
+        parser.add_argument('--dry-run', action='store_true')
+
+    @staticmethod
+    def image_names():
+        for root in IMAGE_ROOTS:
+            # S3 has no directories, a missing one is an empty listing.
+            try:
+                yield from walk(default_storage, root)
+            except FileNotFoundError:
+                continue
+
+    def handle(self, *args, **options):
+        # The recipes marked for deletion keep their images until purged.
+        referenced = set(
+            Recipe.all_objects.order_by().values_list('image', flat=True))
+        threshold = timezone.now() - timedelta(minutes=options['min_age'])
+        deleted = 0
+        for name in self.image_names():
+            if (name in referenced
+                    or default_storage.get_modified_time(name) > threshold):
+                continue
+            if not options['dry_run']:
+                default_storage.delete(name)
+            deleted += 1
+        action = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f'{action} {deleted} orphaned images')
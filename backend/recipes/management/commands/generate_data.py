@@ -0,0 +1,325 @@
+import io
+import json
+import os
+import random
+import time
+from bisect import bisect
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from multiprocessing import Pool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections
+from django.db.models import Max
+from django.utils import timezone
+
+from PIL import Image
+
+from recipes.feed import invalidate_feed
+from recipes.models import (FavoriteRecipes, Follow, Ingredient, Recipe,
+                            RecipeIngredients, ShoppingList, Tag)
+from users.models import User
+
+DATA_ROOT = os.path.join(settings.BASE_DIR, 'data')
+IMAGE_NAME = 'recipes/synthetic.png'
+WORDS = (
+    'нарезать', 'смешать', 'добавить', 'обжарить', 'варить', 'запекать',
+    'посолить', 'поперчить', 'остудить', 'подавать', 'взбить', 'тушить',
+    'на', 'среднем', 'огне', 'до', 'готовности', 'минут', 'и', 'с',
+)
+# Every chunk of recipes or users is generated with its own random
+# generator, so the result depends on the seed and not on the workers.
+CHUNK_SIZE = 10000
+
+
+class Zipf:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1)^s.
+    """
+
+    def __init__(self, n, s=1.1):
+        self.n = n
+        self.cum_weights = list(
+            accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+    def draw(self, rng):
+        return bisect(
+            self.cum_weights, rng.random() * self.cum_weights[-1])
+
+    def sample(self, rng, k):
+        """Draws up to k distinct ranks.
+        """
+        return list(dict.fromkeys(self.draw(rng) for _ in range(k)))
+
+
+def scatter(rank, n):
+    """Maps a popularity rank to an offset in 0..n-1
+    so that popular objects are spread over the whole id range.
+    """
+    return rank * 2654435761 % n
+
+
+def chunk_rng(seed, kind, index):
+    return random.Random(f'{seed}-{kind}-{index}')
+
+
+def count(rng, mean, limit):
+    if mean <= 0:
+        return 0
+    return min(int(rng.expovariate(1 / mean)) + 1, limit)
+
+
+def moment(rng, end, days):
+    """Draws a moment in the window of days before end.
+    """
+    return end - timedelta(seconds=rng.random() * days * 86400)
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """Saves the auto_now_add fields with the dates set on the objects
+    instead of the current time.
+    """
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def generate_recipes(task):
+    """Creates one chunk of recipes with their ingredients and tags.
+    Runs in a worker process when --workers is greater than 1.
+    """
+    (seed, index, first_id, size, user_ids, ingredient_ids, tag_ids,
+     image, end, days, batch_size) = task
+    rng = chunk_rng(seed, 'recipes', index)
+    authors = Zipf(len(user_ids))
+    ingredients = Zipf(len(ingredient_ids))
+    recipes, recipe_ingredients, recipe_tags = [], [], []
+    recipe_tag = Recipe.tags.through
+    for recipe_id in range(first_id, first_id + size):
+        author_id = user_ids[
+            scatter(authors.draw(rng), len(user_ids))]
+        chosen = [
+            ingredient_ids[scatter(rank, len(ingredient_ids))]
+            for rank in ingredients.sample(rng, rng.randint(3, 15))
+        ]
+        recipes.append(Recipe(
+            id=recipe_id,
+            author_id=author_id,
+            name=f'Рецепт {recipe_id}',
+            text=' '.join(rng.choices(WORDS, k=rng.randint(10, 200))),
+            image=image,
+            cooking_time=rng.randint(5, 180),
+            pub_date=moment(rng, end, days),
+        ))
+        recipe_ingredients.extend(
+            RecipeIngredients(
+                recipe_id=recipe_id,
+                ingredient_id=ingredient_id,
+                amount=rng.randint(1, 500),
+            ) for ingredient_id in chosen
+        )
+        recipe_tags.extend(
+            recipe_tag(recipe_id=recipe_id, tag_id=tag_id)
+            for tag_id in rng.sample(tag_ids, rng.randint(1, 3))
+        )
+    with explicit_dates(Recipe._meta.get_field('pub_date')):
+        Recipe.objects.bulk_create(recipes, batch_size=batch_size)
+    RecipeIngredients.objects.bulk_create(
+        recipe_ingredients, batch_size=batch_size)
+    recipe_tag.objects.bulk_create(recipe_tags, batch_size=batch_size)
+    return size
+
+
+def generate_relations(task):
+    """Creates favorites, shopping lists and follows
+    for one chunk of users with Zipf-distributed popularity.
+    The users are new, so the rows deduplicated here are all inserted
+    and the returned number is the number of the created rows.
+    """
+    (seed, index, user_ids, all_user_ids, first_recipe, recipes_count,
+     means, end, days, batch_size) = task
+    rng = chunk_rng(seed, 'relations', index)
+    recipes = Zipf(recipes_count)
+    authors = Zipf(len(all_user_ids))
+    favorites, shopping_list, follows = [], [], []
+    for user_id in user_ids:
+        for model, rows, mean in (
+                (FavoriteRecipes, favorites, means['favorites']),
+                (ShoppingList, shopping_list, means['cart'])):
+            recipe_ids = dict.fromkeys(
+                first_recipe + scatter(rank, recipes_count)
+                for rank in recipes.sample(
+                    rng, count(rng, mean, recipes_count))
+            )
+            rows.extend(
+                model(
+                    user_id=user_id,
+                    recipe_id=recipe_id,
+                    created=moment(rng, end, days)
+                ) for recipe_id in recipe_ids
+            )
+        chosen = {
+            all_user_ids[scatter(rank, len(all_user_ids))]
+            for rank in authors.sample(
+                rng, count(rng, means['follows'], len(all_user_ids)))
+        }
+        chosen.discard(user_id)
+        follows.extend(
+            Follow(user_id=user_id, author_id=author_id)
+            for author_id in sorted(chosen)
+        )
+    with explicit_dates(FavoriteRecipes._meta.get_field('created'),
+                        ShoppingList._meta.get_field('created')):
+        for model, rows in ((FavoriteRecipes, favorites),
+                            (ShoppingList, shopping_list),
+                            (Follow, follows)):
+            model.objects.bulk_create(rows, batch_size=batch_size)
+    return len(favorites) + len(shopping_list) + len(follows)
+
+
+class Command(BaseCommand):
+    help = 'Generates a deterministic synthetic dataset for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument('--favorites', type=float, default=10,
+                            help='Mean number of favorites per user')
+        parser.add_argument('--cart', type=float, default=3,
+                            help='Mean number of recipes in a shopping list')
+        parser.add_argument('--follows', type=float, default=5,
+                            help='Mean number of subscriptions per user')
+        parser.add_argument('--days', type=float, default=365,
+                            help='Window of the publication and addition '
+                                 'dates, in days before now')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per INSERT, the database maximum '
+                                 'if not set')
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--password', type=str,
+                            default='synthetic-password',
+                            help='Password of all the generated users')
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        self.seed = options['seed']
+        self.batch_size = options['batch_size']
+        self.workers = options['workers']
+        # The dates are drawn before the same end for all the chunks.
+        end = timezone.now()
+        days = options['days']
+        if self.workers > 1 and connection.vendor == 'sqlite':
+            raise CommandError('SQLite does not support parallel writes')
+
+        ingredient_ids, tag_ids = self.load_reference_data()
+        image = self.create_image()
+        new_user_ids = self.create_users(
+            options['users'], options['password'])
+        user_ids = list(
+            User.objects.order_by('id').values_list('id', flat=True))
+        if not user_ids:
+            raise CommandError('At least one user is needed')
+
+        first_recipe = (Recipe.all_objects.aggregate(
+            last=Max('id'))['last'] or 0) + 1
+        recipes_count = options['recipes']
+        self.run(generate_recipes, [
+            (self.seed, index, first_recipe + offset,
+             min(CHUNK_SIZE, recipes_count - offset), user_ids,
+             ingredient_ids, tag_ids, image, end, days, self.batch_size)
+            for index, offset in enumerate(
+                range(0, recipes_count, CHUNK_SIZE))
+        ], 'recipes')
+        self.reset_sequences()
+
+        if recipes_count:
+            means = {
+                'favorites': options['favorites'],
+                'cart': options['cart'],
+                'follows': options['follows'],
+            }
+            self.run(generate_relations, [
+                (self.seed, index, new_user_ids[offset:offset + CHUNK_SIZE],
+                 user_ids, first_recipe, recipes_count, means, end, days,
+                 self.batch_size)
+                for index, offset in enumerate(
+                    range(0, len(new_user_ids), CHUNK_SIZE))
+            ], 'favorites, shopping list and follow rows')
+        invalidate_feed()
+        self.stdout.write(f'Done in {time.monotonic() - start:.1f}s')
+
+    def run(self, function, tasks, name):
+        started = time.monotonic()
+        if self.workers > 1:
+            connections.close_all()
+            with Pool(self.workers) as pool:
+                created = sum(pool.imap_unordered(function, tasks))
+        else:
+            created = sum(map(function, tasks))
+        self.stdout.write(
+            f'Created {created} {name} '
+            f'in {time.monotonic() - started:.1f}s')
+
+    def load_reference_data(self):
+        """Loads ingredients and tags from the data folder
+        if the database does not have them yet.
+        """
+        for model, filename in ((Ingredient, 'ingredients.json'),
+                                (Tag, 'tags.json')):
+            if model.objects.exists():
+                continue
+            with open(os.path.join(DATA_ROOT, filename), 'r',
+                      encoding='utf-8') as f:
+                model.objects.bulk_create(
+                    [model(**item) for item in json.load(f)],
+                    ignore_conflicts=True
+                )
+        return (
+            list(Ingredient.objects.order_by('id').values_list(
+                'id', flat=True)),
+            list(Tag.objects.order_by('id').values_list('id', flat=True)),
+        )
+
+    def create_image(self):
+        """Stores the image shared by all the generated recipes
+        and returns its name in the storage.
+        """
+        content = io.BytesIO()
+        Image.new('RGB', (64, 64), (230, 200, 160)).save(content, 'PNG')
+        return default_storage.save(IMAGE_NAME, content)
+
+    def create_users(self, users_count, password):
+        first_user = (User.objects.aggregate(
+            last=Max('id'))['last'] or 0) + 1
+        password = make_password(password)
+        user_ids = list(range(first_user, first_user + users_count))
+        User.objects.bulk_create([
+            User(
+                id=user_id,
+                username=f'synthetic_{self.seed}_{user_id}',
+                email=f'synthetic_{self.seed}_{user_id}@example.com',
+                first_name='Synthetic',
+                last_name=str(user_id),
+                password=password,
+            ) for user_id in user_ids
+        ], batch_size=self.batch_size)
+        self.stdout.write(f'Created {users_count} users')
+        return user_ids
+
+    def reset_sequences(self):
+        """Moves the id sequences past the explicitly set ids.
+        """
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                    no_style(), [User, Recipe]):
+                cursor.execute(sql)
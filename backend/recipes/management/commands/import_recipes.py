@@ -0,0 +1,45 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.translation import gettext as _
+
+from api.imports import RecipeImporter
+from users.models import User
+
+DATA_ROOT = os.path.join(settings.BASE_DIR, 'data')
+
+
+class Command(BaseCommand):
+    help = 'Imports recipes from a newline-delimited JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('filename', type=str)
+        parser.add_argument('--author', required=True, type=str,
+                            help='Email of the author of the recipes')
+        parser.add_argument('--chunk-size', type=int,
+                            default=settings.IMPORT_CHUNK_SIZE)
+        parser.add_argument('--workers', type=int,
+                            default=settings.IMPORT_WORKERS)
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(email=options['author'])
+        except User.DoesNotExist:
+            raise CommandError(_('The author does not exist'))
+        importer = RecipeImporter(
+            author=author,
+            chunk_size=options['chunk_size'],
+            workers=options['workers']
+        )
+        try:
+            with open(os.path.join(DATA_ROOT, options['filename']), 'r',
+                      encoding='utf-8') as f:
+                report = importer.run(f)
+        except FileNotFoundError:
+            raise CommandError(_('The file is missing in the data folder'))
+        for error in report['errors']:
+            self.stderr.write(json.dumps(error, ensure_ascii=False))
+        self.stdout.write(
+            f'Created: {report["created"]}, failed: {report["failed"]}')
@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from recipes.trending import update_trending
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the trending recipes ranking from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Recompute every TRENDING_REFRESH_INTERVAL '
+                                 'seconds until stopped')
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.monotonic()
+            ranked = update_trending()
+            self.stdout.write(
+                f'Ranked {ranked} recipes '
+                f'in {time.monotonic() - start:.1f}s')
+            if not options['loop']:
+                return
+            time.sleep(settings.TRENDING_REFRESH_INTERVAL)
@@ -0,0 +1,119 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from foodgram.operations import (AddIndexConcurrently,
+                                 RemoveFieldIndexConcurrently)
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built concurrently, see foodgram.operations.
+    atomic = False
+
+    dependencies = [
+        ('recipes', '0005_recipe_is_deleted'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['-pub_date'], name='recipe_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-pub_date'], name='recipe_author_pub_date_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='favoriterecipes',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='favorites', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='favoriterecipes',
+                    name='user',
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='follow',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='follower', to=settings.AUTH_USER_MODEL, verbose_name='Подписчики'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='follow',
+                    name='user',
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='author',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='recipes', to=settings.AUTH_USER_MODEL, verbose_name='Автор рецепта'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='recipe',
+                    name='author',
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='recipeingredients',
+                    name='recipe',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='recipes', to='recipes.Recipe', verbose_name='Рецепт'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='recipeingredients',
+                    name='recipe',
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='recipetags',
+                    name='recipe',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='recipes_tags', to='recipes.Recipe', verbose_name='Рецепт'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='recipetags',
+                    name='recipe',
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='shoppinglist',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+                ),
+            ],
+            database_operations=[
+                RemoveFieldIndexConcurrently(
+                    model_name='shoppinglist',
+                    name='user',
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-19 12:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from foodgram.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # The indexes are built concurrently, see foodgram.operations.
+    atomic = False
+
+    dependencies = [
+        ('recipes', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingRecipe',
+            fields=[
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='recipes.Recipe', verbose_name='Рецепт')),
+                ('score', models.FloatField(verbose_name='Популярность')),
+            ],
+            options={
+                'verbose_name': 'Популярный рецепт',
+                'verbose_name_plural': 'Популярные рецепты',
+                'ordering': ('-score', '-recipe'),
+            },
+        ),
+        # The existing adds are dated by the migration.
+        migrations.AddField(
+            model_name='favoriterecipes',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Дата добавления'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='shoppinglist',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Дата добавления'),
+            preserve_default=False,
+        ),
+        AddIndexConcurrently(
+            model_name='favoriterecipes',
+            index=models.Index(fields=['created'], name='favorite_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shoppinglist',
+            index=models.Index(fields=['created'], name='shopping_list_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingrecipe',
+            index=models.Index(fields=['-score', '-recipe'], name='trending_score_idx'),
+        ),
+    ]
@@ -58,6 +58,14 @@ class Ingredient (models.Model):
         return self.name[:settings.STRING_LEN]
 
 
+class RecipeManager(models.Manager):
+    """Recipes not marked for deletion.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class Recipe(models.Model):
     name = models.CharField(
         max_length=settings.STRING_LEN_FIELD_3,
@@ -75,12 +83,15 @@ class Recipe(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='recipes',
+        # Indexed by recipe_author_pub_date_idx.
+        db_index=False,
         verbose_name='Автор рецепта'
     )
     image = models.ImageField(
         'Image',
         upload_to='recipes/',
-        blank=False
+        blank=False,
+        db_index=True
     )
     cooking_time = models.PositiveSmallIntegerField(
         blank=False,
@@ -103,9 +114,28 @@ class Recipe(models.Model):
         auto_now_add=True,
         verbose_name='Дата публикации'
     )
+    is_deleted = models.BooleanField(
+        default=False,
+        verbose_name='Помечен на удаление'
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Просмотры'
+    )
+
+    objects = RecipeManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        # The feed and the author's recipes are read newest first.
+        indexes = (
+            models.Index(fields=('-pub_date',), name='recipe_pub_date_idx'),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='recipe_author_pub_date_idx'
+            ),
+        )
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
 
@@ -118,6 +148,8 @@ class RecipeIngredients (models.Model):
         Recipe,
         on_delete=models.CASCADE,
         related_name='recipes',
+        # Indexed by the unique constraint starting with it.
+        db_index=False,
         verbose_name='Рецепт'
     )
     ingredient = models.ForeignKey(
@@ -149,6 +181,8 @@ class RecipeTags (models.Model):
         Recipe,
         on_delete=models.CASCADE,
         related_name='recipes_tags',
+        # Indexed by the unique constraint starting with it.
+        db_index=False,
         verbose_name='Рецепт'
     )
     tag = models.ForeignKey(
@@ -177,8 +211,14 @@ class CommonModel(models.Model):
         User,
         on_delete=models.CASCADE,
         null=True,
+        # Indexed by the unique constraint starting with it.
+        db_index=False,
         verbose_name='Пользователь'
     )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата добавления'
+    )
 
     class Meta:
         abstract = True
@@ -189,6 +229,14 @@ class FavoriteRecipes (CommonModel):
     class Meta:
         ordering = ('-id',)
         default_related_name = 'favorites'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe'],
+                name='unique_favorite_recipe')]
+        # The recent adds are read by the trending ranking.
+        indexes = (
+            models.Index(fields=('created',), name='favorite_created_idx'),
+        )
         verbose_name = 'Избранный рецепт'
         verbose_name_plural = 'Избранные рецепты'
 
@@ -201,6 +249,14 @@ class ShoppingList (CommonModel):
     class Meta:
         ordering = ('-id',)
         default_related_name = 'shopping_list'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recipe'],
+                name='unique_shopping_list_recipe')]
+        indexes = (
+            models.Index(
+                fields=('created',), name='shopping_list_created_idx'),
+        )
         verbose_name = 'Шопинг лист'
 
     def __str__(self):
@@ -212,6 +268,8 @@ class Follow(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name='follower',
+        # Indexed by the unique constraint starting with it.
+        db_index=False,
         verbose_name='Подписчики'
     )
     author = models.ForeignKey(
@@ -228,3 +286,29 @@ class Follow(models.Model):
                 name='unique_subscriptions')]
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
+
+
+class TrendingRecipe(models.Model):
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Рецепт'
+    )
+    score = models.FloatField(
+        verbose_name='Популярность'
+    )
+
+    class Meta:
+        ordering = ('-score', '-recipe')
+        # The trending feed is read by the score, highest first.
+        indexes = (
+            models.Index(
+                fields=('-score', '-recipe'), name='trending_score_idx'),
+        )
+        verbose_name = 'Популярный рецепт'
+        verbose_name_plural = 'Популярные рецепты'
+
+    def __str__(self):
+        return f'{self.recipe}: {self.score:.2f}'
@@ -0,0 +1,50 @@
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from .storage import ContentAddressedMixin
+
+
+class S3ContentAddressedStorage(ContentAddressedMixin, S3Boto3Storage):
+    """Content-addressed storage in an S3-compatible bucket (S3, MinIO).
+    Files uploaded directly by the clients with presigned_upload()
+    are claimed by saving a File with the upload_name attribute:
+    the upload is copied to its content-addressed name inside the bucket
+    and deleted.
+    """
+
+    def key(self, name):
+        return self._normalize_name(self._clean_name(name))
+
+    def presigned_upload(self, name, max_size, expires):
+        """Returns the url and the form fields of a POST request
+        uploading a file of at most max_size bytes under the name.
+        """
+        return self.bucket.meta.client.generate_presigned_post(
+            self.bucket_name,
+            self.key(name),
+            Conditions=[['content-length-range', 1, max_size]],
+            ExpiresIn=expires,
+        )
+
+    def touch(self, name):
+        # S3 sets the modified time of an object only when it is written.
+        self.bucket.Object(self.key(name)).copy_from(
+            CopySource={'Bucket': self.bucket_name, 'Key': self.key(name)},
+            MetadataDirective='REPLACE',
+            **self._get_write_parameters(name)
+        )
+
+    def store(self, name, content):
+        upload_name = getattr(content, 'upload_name', None)
+        if upload_name is None:
+            return super().store(name, content)
+        if self.exists(name):
+            self.touch(name)
+        else:
+            self.bucket.Object(self.key(name)).copy_from(
+                CopySource={'Bucket': self.bucket_name,
+                            'Key': self.key(upload_name)},
+                MetadataDirective='REPLACE',
+                **self._get_write_parameters(name, content)
+            )
+        self.delete(upload_name)
+        return name
@@ -0,0 +1,42 @@
+from .feed import invalidate_feed
+from .jobs import release_image
+
+
+def stored_image(instance):
+    """Name of the loaded image, without loading a deferred field.
+    """
+    image = instance.__dict__.get('image')
+    return getattr(image, 'name', image)
+
+
+def remember_image(sender, instance, **kwargs):
+    instance._stored_image = stored_image(instance)
+
+
+def image_replaced(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stored_image', None)
+    current = stored_image(instance)
+    if not created and previous and previous != current:
+        release_image.delay(previous)
+    instance._stored_image = current
+
+
+def recipe_deleted(sender, instance, **kwargs):
+    name = stored_image(instance)
+    if name:
+        release_image.delay(name)
+
+
+def recipe_created(sender, instance, created, **kwargs):
+    if created:
+        invalidate_feed()
+
+
+def recipe_tags_changed(sender, action, pk_set, **kwargs):
+    if action == 'post_clear' or action in (
+            'post_add', 'post_remove') and pk_set:
+        invalidate_feed()
+
+
+def feed_changed(sender, **kwargs):
+    invalidate_feed()
@@ -0,0 +1,53 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+
+def content_hash(content):
+    sha = hashlib.sha256()
+    for chunk in content.chunks():
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ContentAddressedMixin:
+    """Names the uploaded files by the SHA-256 of their content:
+    recipes/photo.jpg is stored as recipes/ab/ab12...ef.jpg.
+    An identical upload reuses the stored file, and a name never
+    changes its content, so the files can be cached forever.
+    The files are deleted by recipes.signals once no recipe uses them,
+    a reused file is touched so that it is not deleted in the meantime:
+    the storages using the mixin define touch(name), which sets
+    the modified time of the stored file to now.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = content_hash(content)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, digest[:2], digest + extension)
+        return self.store(name.replace('\\', '/'), content)
+
+    def store(self, name, content):
+        if self.exists(name):
+            self.touch(name)
+            return name
+        saved = self._save(name, content)
+        if saved != name:
+            # The same content was saved concurrently under this name.
+            self.delete(saved)
+        return name
+
+
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+    """Content-addressed storage in MEDIA_ROOT.
+    """
+
+    def touch(self, name):
+        os.utime(self.path(name))
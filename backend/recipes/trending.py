@@ -0,0 +1,54 @@
+from collections import defaultdict
+from datetime import timedelta
+from heapq import nlargest
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .feed import invalidate_feed
+from .models import FavoriteRecipes, ShoppingList, TrendingRecipe
+
+# Adds counted by the ranking.
+EVENT_MODELS = (FavoriteRecipes, ShoppingList)
+
+
+def decayed_scores(now):
+    """Scores of the recipes added to favorites or a shopping list
+    during TRENDING_WINDOW. Every add counts 1 and halves every
+    TRENDING_HALF_LIFE, the adds are counted by hour in the database.
+    """
+    since = now - timedelta(seconds=settings.TRENDING_WINDOW)
+    scores = defaultdict(float)
+    for model in EVENT_MODELS:
+        rows = model.objects.filter(
+            created__gte=since
+        ).annotate(
+            hour=TruncHour('created')
+        ).order_by().values('recipe_id', 'hour').annotate(
+            adds=Count('id')
+        ).values_list('recipe_id', 'hour', 'adds')
+        for recipe_id, hour, adds in rows.iterator():
+            age = (now - hour).total_seconds()
+            scores[recipe_id] += adds * 0.5 ** (
+                age / settings.TRENDING_HALF_LIFE)
+    return scores
+
+
+@transaction.atomic
+def update_trending(now=None):
+    """Replaces the ranking with the TRENDING_SIZE recipes
+    of the highest scores.
+    """
+    scores = decayed_scores(now or timezone.now())
+    top = nlargest(settings.TRENDING_SIZE, scores.items(), key=itemgetter(1))
+    TrendingRecipe.objects.all().delete()
+    TrendingRecipe.objects.bulk_create(
+        [TrendingRecipe(recipe_id=recipe_id, score=score)
+         for recipe_id, score in top]
+    )
+    invalidate_feed()
+    return len(top)
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from recipes.deletion import delete_user
+
 from .models import User
 
 
@@ -20,6 +22,13 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ('email', 'first_name')
     empty_value_display = '-empty-'
 
+    def delete_model(self, request, obj):
+        delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            delete_user(user)
+
     def followers(self, obj):
         """The function counts total number
         of followers.
@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from rest_framework.authtoken.models import Token
+
+        from .models import User
+        from .signals import token_deleted, user_saved
+
+        post_delete.connect(token_deleted, sender=Token)
+        post_save.connect(user_saved, sender=User)
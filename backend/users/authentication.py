@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from foodgram.caches import cache_shared
+
+# User fields copied into the tokens, so that the user
+# can be built from the access token without a database query.
+CLAIM_FIELDS = (
+    'email',
+    'username',
+    'first_name',
+    'last_name',
+    'is_staff',
+    'is_superuser',
+)
+
+
+def build_user(values):
+    """Builds a User from a dict of field values without a query.
+    The missing fields are deferred and loaded on first access.
+    """
+    # from_db() expects the values in the order of the model fields.
+    field_names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in values
+    ]
+    return User.from_db(
+        'default', field_names, [values[name] for name in field_names])
+
+
+def add_user_claims(token, user):
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    return token
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues a refresh and an access token carrying the user fields.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """Issues a new access token with the current user fields.
+    Refreshing fails for deleted and deactivated users,
+    so their access ends when the last access token expires.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh[api_settings.USER_ID_CLAIM]
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}, is_active=True
+        ).first()
+        if user is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found')
+        add_user_claims(refresh, user)
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Authenticates by the access token without a database query.
+    The user is built from the token claims, the rest of the fields
+    are deferred and loaded only if they are accessed,
+    and saving the user writes only the loaded fields.
+    """
+
+    def get_user(self, validated_token):
+        if any(field not in validated_token for field in CLAIM_FIELDS):
+            return super().get_user(validated_token)
+        claims = {
+            field: validated_token[field] for field in CLAIM_FIELDS}
+        claims[api_settings.USER_ID_FIELD] = validated_token[
+            api_settings.USER_ID_CLAIM]
+        claims['is_active'] = True
+        return build_user(claims)
+
+
+def token_cache_key(key):
+    return f'auth_token:{key}'
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication keeping token -> user fields in the cache,
+    so that only the first request with a token queries the database.
+    Entries are removed when the token is deleted (logout)
+    and when the user is saved (password change, deactivation),
+    see users.signals. Without a cache shared by the processes
+    every request queries the token.
+    """
+
+    def authenticate_credentials(self, key):
+        if not cache_shared():
+            return super().authenticate_credentials(key)
+        cache_key = token_cache_key(key)
+        values = cache.get(cache_key)
+        if values is None:
+            token = Token.objects.select_related('user').filter(
+                key=key).first()
+            if token is None:
+                raise AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise AuthenticationFailed(_('User inactive or deleted.'))
+            values = {
+                field: getattr(token.user, field)
+                for field in ('id', 'is_active') + CLAIM_FIELDS
+            }
+            cache.set(
+                cache_key, values, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        return build_user(values), key
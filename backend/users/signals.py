@@ -0,0 +1,15 @@
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token
+
+
+def token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+def user_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list(
+            'key', flat=True):
+        invalidate_token(key)
@@ -1,6 +1,7 @@
 from django.urls import include, path
 
 from rest_framework.routers import DefaultRouter
+from rest_framework_simplejwt.views import TokenBlacklistView
 
 from api.views import CustomUserViewSet
 
@@ -14,4 +15,7 @@ urlpatterns = [
     path('', include(v1_router.urls)),
     path('', include('djoser.urls')),
     path('auth/', include('djoser.urls.authtoken')),
+    path('auth/', include('djoser.urls.jwt')),
+    path('auth/jwt/blacklist/', TokenBlacklistView.as_view(),
+         name='jwt-blacklist'),
 ]
@@ -0,0 +1,114 @@
+import base64
+import io
+import time
+
+import pytest
+from django.core.cache import cache
+from PIL import Image
+from rest_framework.test import APIClient
+
+from recipes.counters import view_counter
+from recipes.models import Ingredient, Tag
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_view_counter():
+    # The views left at exit would be written without a database.
+    view_counter.counts.clear()
+    view_counter.flushed = time.monotonic()
+    yield
+    view_counter.counts.clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path / 'cache'),
+    }}
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='cook', email='cook@example.com',
+        first_name='Cook', last_name='Cookov', password='cook-password')
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='chef', email='chef@example.com',
+        first_name='Chef', last_name='Chefov', password='chef-password')
+
+
+@pytest.fixture
+def user_client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def ingredients(db):
+    return [
+        Ingredient.objects.create(
+            name=f'Ингредиент {number}', measurement_unit='г')
+        for number in range(30)
+    ]
+
+
+@pytest.fixture
+def tags(db):
+    return [
+        Tag.objects.create(
+            name=f'Тег {number}', color=f'#0000{number:02d}',
+            slug=f'tag-{number}')
+        for number in range(3)
+    ]
+
+
+def png(color=(230, 200, 160)):
+    content = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(content, 'PNG')
+    return content.getvalue()
+
+
+@pytest.fixture
+def image_content():
+    return png()
+
+
+@pytest.fixture
+def image(image_content):
+    return 'data:image/png;base64,' + base64.b64encode(image_content).decode()
+
+
+@pytest.fixture
+def recipe_data(ingredients, tags, image):
+    def build(ingredients_count=1, **fields):
+        return {
+            'ingredients': [
+                {'id': ingredient.id, 'amount': 10}
+                for ingredient in ingredients[:ingredients_count]
+            ],
+            'tags': [tag.id for tag in tags],
+            'image': image,
+            'name': 'Борщ',
+            'text': 'Сварить',
+            'cooking_time': 60,
+            **fields,
+        }
+    return build
@@ -0,0 +1,53 @@
+import io
+import os
+import time
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from recipes.deletion import delete_recipe
+from recipes.jobs import release_image
+from recipes.models import Recipe
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def old_image(image_content):
+    name = default_storage.save('recipes/photo.png', ContentFile(image_content))
+    modified = time.time() - 2 * 60 * 60
+    os.utime(default_storage.path(name), (modified, modified))
+    return name
+
+
+@pytest.fixture
+def hidden_recipe(user, old_image):
+    recipe = Recipe.objects.create(
+        author=user, name='Борщ', text='Сварить', image=old_image,
+        cooking_time=60)
+    delete_recipe(recipe)
+    return recipe
+
+
+def test_deleted_recipe_is_hidden(hidden_recipe):
+    assert not Recipe.objects.filter(pk=hidden_recipe.pk).exists()
+    assert Recipe.all_objects.filter(pk=hidden_recipe.pk).exists()
+
+
+def test_release_keeps_the_image_of_a_hidden_recipe(hidden_recipe):
+    release_image(hidden_recipe.image.name)
+    assert default_storage.exists(hidden_recipe.image.name)
+
+
+def test_cleanup_keeps_the_image_of_a_hidden_recipe(hidden_recipe):
+    call_command('cleanup_images', stdout=io.StringIO())
+    assert default_storage.exists(hidden_recipe.image.name)
+
+
+def test_generate_data_after_deleting_the_newest_recipe(hidden_recipe):
+    options = {'users': 2, 'recipes': 3, 'stdout': io.StringIO()}
+    call_command('generate_data', **options)
+    assert Recipe.objects.count() == 3
+    assert Recipe.all_objects.count() == 4
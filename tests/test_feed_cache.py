@@ -0,0 +1,23 @@
+import pytest
+from prometheus_client import REGISTRY
+
+pytestmark = pytest.mark.django_db
+
+
+def lookups(result):
+    return REGISTRY.get_sample_value(
+        'foodgram_feed_cache_lookups_total', {'result': result}) or 0
+
+
+def test_feed_is_not_cached_in_a_per_process_cache(client):
+    before = lookups('bypass'), lookups('miss')
+    assert client.get('/api/recipes/').status_code == 200
+    assert (lookups('bypass'), lookups('miss')) == (
+        before[0] + 1, before[1])
+
+
+def test_feed_is_cached_in_a_shared_cache(shared_cache, client):
+    assert client.get('/api/recipes/').status_code == 200
+    hits = lookups('hit')
+    assert client.get('/api/recipes/').status_code == 200
+    assert lookups('hit') > hits
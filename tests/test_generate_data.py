@@ -0,0 +1,37 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from recipes.models import FavoriteRecipes, Follow, Recipe, ShoppingList
+
+pytestmark = pytest.mark.django_db
+
+
+def generate(**options):
+    stdout = io.StringIO()
+    call_command('generate_data', stdout=stdout, **{
+        'users': 20, 'recipes': 50, 'days': 30, **options})
+    return stdout.getvalue()
+
+
+def test_dates_are_spread_over_the_window():
+    start = timezone.now() - timedelta(days=30)
+    generate()
+    for queryset, field in ((Recipe.objects, 'pub_date'),
+                            (FavoriteRecipes.objects, 'created'),
+                            (ShoppingList.objects, 'created')):
+        dates = queryset.aggregate(first=Min(field), last=Max(field))
+        assert start <= dates['first']
+        assert dates['last'] - dates['first'] > timedelta(days=1)
+
+
+def test_reported_relations_are_the_created_rows():
+    output = generate()
+    created = (FavoriteRecipes.objects.count()
+               + ShoppingList.objects.count() + Follow.objects.count())
+    assert f'Created {created} favorites, shopping list and follow rows' in (
+        output)
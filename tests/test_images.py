@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from jobs.models import Job
+from recipes.jobs import release_image
+from recipes.models import Recipe
+
+pytestmark = pytest.mark.django_db
+
+HOUR = 60 * 60
+
+
+@pytest.fixture
+def store(image_content):
+    return lambda: default_storage.save(
+        'recipes/photo.png', ContentFile(image_content))
+
+
+def age(name, seconds):
+    modified = time.time() - seconds
+    os.utime(default_storage.path(name), (modified, modified))
+
+
+def test_identical_upload_reuses_and_touches_the_file(store):
+    name = store()
+    age(name, 2 * HOUR)
+    assert store() == name
+    assert time.time() - os.path.getmtime(default_storage.path(name)) < 60
+
+
+def test_release_postpones_a_recently_reused_file(store):
+    name = store()
+    release_image(name)
+    assert default_storage.exists(name)
+    job = Job.objects.get(name=release_image.job_name)
+    assert json.loads(job.payload)['args'] == [name]
+
+
+def test_release_deletes_an_old_unreferenced_file(store):
+    name = store()
+    age(name, 2 * HOUR)
+    release_image(name)
+    assert not default_storage.exists(name)
+
+
+def test_release_keeps_a_referenced_file(store, user):
+    name = store()
+    age(name, 2 * HOUR)
+    Recipe.objects.create(
+        author=user, name='Борщ', text='Сварить', image=name,
+        cooking_time=60)
+    release_image(name)
+    assert default_storage.exists(name)
@@ -0,0 +1,134 @@
+import json
+import os
+
+import pytest
+from django.core.files.storage import default_storage
+from django.db import DatabaseError
+from rest_framework.test import APIClient
+
+from api.imports import RecipeImporter
+from jobs.models import Job
+from jobs.worker import Worker
+from recipes.jobs import release_image
+from recipes.models import Recipe
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def admin_client(user):
+    user.is_staff = True
+    user.save()
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def ndjson(*records):
+    return '\n'.join(
+        record if isinstance(record, str) else json.dumps(record)
+        for record in records
+    ).encode()
+
+
+def test_import_is_run_by_a_job(admin_client, user, recipe_data):
+    response = admin_client.post(
+        '/api/recipes/import/',
+        ndjson(recipe_data(3), recipe_data(1, cooking_time=0), '{'),
+        content_type='application/x-ndjson'
+    )
+    assert response.status_code == 202, response.data
+    assert not Recipe.objects.exists()
+
+    worker = Worker()
+    job = worker.claim()
+    worker.run(job)
+    assert not default_storage.exists(json.loads(job.payload)['args'][0])
+
+    response = admin_client.get(f'/api/recipes/import/{response.data["id"]}/')
+    assert response.data['status'] == Job.DONE
+    report = response.data['report']
+    assert report['created'] == 1
+    assert [error['line'] for error in report['errors']] == [2, 3]
+    assert Recipe.objects.get().author == user
+
+
+def test_import_runs_in_the_request_with_immediate_jobs(
+        settings, admin_client, recipe_data):
+    settings.JOBS_BACKEND = 'immediate'
+    response = admin_client.post(
+        '/api/recipes/import/', ndjson(recipe_data(), recipe_data()),
+        content_type='application/x-ndjson'
+    )
+    assert response.status_code == 200
+    assert response.data['created'] == 2
+
+
+def test_import_requires_staff(user_client):
+    response = user_client.post(
+        '/api/recipes/import/', b'', content_type='application/x-ndjson')
+    assert response.status_code == 403
+
+
+@pytest.fixture
+def direct_upload(monkeypatch, image_content):
+    monkeypatch.setattr(
+        'api.serializers.direct_uploads_supported', lambda: True)
+
+    def upload(user):
+        name = f'uploads/{user.id}/{"0" * 32}.png'
+        path = default_storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(image_content)
+        return name
+    return upload
+
+
+def test_import_reports_unsupported_direct_uploads(user, recipe_data):
+    report = RecipeImporter(author=user).run([
+        json.dumps(recipe_data(image=f'uploads/{user.id}/{"0" * 32}.png')),
+        json.dumps(recipe_data()),
+    ])
+    assert report['created'] == 1
+    assert [error['line'] for error in report['errors']] == [1]
+    assert 'image' in report['errors'][0]['errors']
+
+
+def test_import_accepts_direct_uploads_of_the_author(
+        user, another_user, recipe_data, direct_upload):
+    report = RecipeImporter(author=user).run([
+        json.dumps(recipe_data(image=direct_upload(user))),
+        json.dumps(recipe_data(image=direct_upload(another_user))),
+    ])
+    assert report['created'] == 1
+    assert [error['line'] for error in report['errors']] == [2]
+
+
+def test_failed_chunk_releases_its_images(monkeypatch, user, recipe_data):
+    def fail(*args):
+        raise DatabaseError('failed')
+    monkeypatch.setattr(RecipeImporter, 'save', fail)
+    report = RecipeImporter(author=user).run([
+        json.dumps(recipe_data()), json.dumps(recipe_data(2))])
+    assert report['failed'] == 2
+    jobs = Job.objects.filter(name=release_image.job_name)
+    assert len(jobs) == 1
+    assert default_storage.exists(json.loads(jobs[0].payload)['args'][0])
+
+
+def test_direct_upload_is_closed_after_the_import(
+        monkeypatch, user, recipe_data, direct_upload):
+    opened = []
+    storage_open = default_storage.open
+
+    def tracked_open(name, *args):
+        file = storage_open(name, *args)
+        opened.append(file)
+        return file
+    monkeypatch.setattr(default_storage, 'open', tracked_open)
+    report = RecipeImporter(author=user).run([
+        json.dumps(recipe_data(image=direct_upload(user)))])
+    assert report['created'] == 1
+    assert opened
+    assert all(file.closed for file in opened)
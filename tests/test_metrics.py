@@ -0,0 +1,26 @@
+import pytest
+from prometheus_client import REGISTRY
+
+pytestmark = pytest.mark.django_db
+
+
+def serialized(route):
+    return REGISTRY.get_sample_value(
+        'foodgram_request_serialize_seconds_count',
+        {'route': route, 'method': 'GET'}
+    ) or 0
+
+
+@pytest.mark.parametrize('url, route', [
+    ('/api/recipes/', 'recipes-list'),
+    ('/api/recipes/?fields=id,name', 'recipes-list'),
+    ('/api/recipes/{id}/', 'recipes-detail'),
+])
+def test_serialization_time_is_recorded(
+        user_client, recipe_data, url, route):
+    recipe = user_client.post(
+        '/api/recipes/', recipe_data(), format='json').data
+    before = serialized(route)
+    response = user_client.get(url.format(id=recipe['id']))
+    assert response.status_code == 200
+    assert serialized(route) == before + 1
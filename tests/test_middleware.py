@@ -0,0 +1,71 @@
+import pytest
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+LOGIN = '/admin/login/'
+
+
+@pytest.fixture
+def admin(user):
+    user.is_staff = True
+    user.is_superuser = True
+    user.save()
+    return user
+
+
+def login_data(user):
+    return {'username': user.email, 'password': 'cook-password',
+            'next': '/admin/'}
+
+
+def test_admin_rejects_post_without_csrf_token(admin):
+    client = Client(enforce_csrf_checks=True)
+    response = client.post(LOGIN, login_data(admin))
+    assert response.status_code == 403
+
+
+def test_admin_login_keeps_the_session(admin):
+    client = Client(enforce_csrf_checks=True)
+    client.get(LOGIN)
+    response = client.post(LOGIN, {
+        **login_data(admin),
+        'csrfmiddlewaretoken': client.cookies['csrftoken'].value,
+    })
+    assert response.status_code == 302
+    assert 'sessionid' in response.cookies
+    assert client.get('/admin/').status_code == 200
+
+
+def test_admin_shows_messages(admin):
+    client = Client()
+    client.force_login(admin)
+    response = client.post('/admin/recipes/tag/add/', {
+        'name': 'Завтрак', 'color': '#E26C2D', 'slug': 'breakfast',
+    }, follow=True)
+    assert response.status_code == 200
+    assert len(response.context['messages']) == 1
+
+
+def test_api_responses_set_no_cookies(user, recipe_data):
+    client = APIClient(enforce_csrf_checks=True)
+    token = Token.objects.create(user=user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    response = client.post('/api/recipes/', recipe_data(), format='json')
+    assert response.status_code == 201, response.data
+    assert not response.cookies
+    response = client.get('/api/recipes/')
+    assert response.status_code == 200
+    assert not response.cookies
+    assert not hasattr(response.wsgi_request, 'session')
+    assert not hasattr(response.wsgi_request, '_messages')
+
+
+def test_api_ignores_the_admin_session(admin):
+    client = Client()
+    client.force_login(admin)
+    assert client.get('/admin/').status_code == 200
+    assert client.get(
+        '/api/recipes/download_shopping_cart/').status_code == 401
@@ -0,0 +1,20 @@
+import pytest
+from django.db import connection
+
+from monitoring.management.commands.check_query_plans import (PLAN_CASES,
+                                                              query_plan)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='The plans are checked on PostgreSQL'),
+]
+
+
+@pytest.mark.parametrize('name', PLAN_CASES)
+def test_query_plan_uses_the_indexes(name):
+    build, indexes = PLAN_CASES[name]
+    plan = query_plan(build)
+    for index in indexes:
+        assert index in plan, plan
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.readers import RecipeListReader
+from api.serializers import (IngredientSerializer, RecipeReadSerializer,
+                             TagSerializer)
+from recipes.models import (FavoriteRecipes, Follow, Ingredient, Recipe,
+                            RecipeIngredients, ShoppingList, Tag)
+
+pytestmark = pytest.mark.django_db
+
+
+def plain(data):
+    return json.loads(json.dumps(data))
+
+
+@pytest.fixture
+def recipes(user, another_user, ingredients, tags):
+    recipes = []
+    for number, author in enumerate((user, another_user, another_user)):
+        recipe = Recipe.objects.create(
+            author=author, name=f'Рецепт {number}', text='Сварить',
+            image=f'recipes/{number}.png', cooking_time=number + 1,
+            views=number)
+        recipe.tags.set(tags[:number + 1])
+        RecipeIngredients.objects.bulk_create([
+            RecipeIngredients(
+                recipe=recipe, ingredient=ingredient, amount=number + 10)
+            for ingredient in ingredients[number:number + 3]
+        ])
+        recipes.append(recipe)
+    FavoriteRecipes.objects.create(user=user, recipe=recipes[1])
+    ShoppingList.objects.create(user=user, recipe=recipes[2])
+    Follow.objects.create(user=user, author=another_user)
+    return recipes
+
+
+def drf_request(user):
+    request = Request(APIRequestFactory().get('/api/recipes/'))
+    request.user = user
+    return request
+
+
+@pytest.mark.parametrize('authenticated', [True, False])
+def test_recipe_list_reader_matches_serializer(user, recipes, authenticated):
+    request = drf_request(user if authenticated else AnonymousUser())
+    ids = [recipe.id for recipe in reversed(recipes)]
+    expected = RecipeReadSerializer(
+        [Recipe.objects.get(id=pk) for pk in ids], many=True,
+        context={'request': request}).data
+    assert plain(RecipeListReader(request).build(ids)) == plain(expected)
+
+
+def test_recipe_list_matches_serializer(user, recipes):
+    client = APIClient()
+    client.force_authenticate(user)
+    response = client.get('/api/recipes/')
+    expected = RecipeReadSerializer(
+        Recipe.objects.all(), many=True,
+        context={'request': drf_request(user)}).data
+    assert response.json()['results'] == plain(expected)
+
+
+@pytest.mark.parametrize('url, model, serializer', [
+    ('/api/tags/', Tag, TagSerializer),
+    ('/api/ingredients/', Ingredient, IngredientSerializer),
+])
+def test_values_list_matches_serializer(client, ingredients, tags,
+                                        url, model, serializer):
+    response = client.get(url)
+    assert response.json() == plain(
+        serializer(model.objects.all(), many=True).data)
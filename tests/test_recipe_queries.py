@@ -0,0 +1,35 @@
+import pytest
+
+# The number of queries of creating and updating a recipe
+# does not depend on the number of its ingredients.
+CREATE_QUERIES = 12
+UPDATE_QUERIES = 15
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('ingredients_count', [1, 30])
+def test_create_recipe_queries(user_client, recipe_data,
+                               django_assert_num_queries, ingredients_count):
+    data = recipe_data(ingredients_count)
+    with django_assert_num_queries(CREATE_QUERIES):
+        response = user_client.post('/api/recipes/', data, format='json')
+    assert response.status_code == 201, response.data
+    assert len(response.data['ingredients']) == ingredients_count
+
+
+@pytest.mark.parametrize('ingredients_count', [1, 30])
+def test_update_recipe_queries(user_client, recipe_data,
+                               django_assert_num_queries, ingredients_count):
+    response = user_client.post(
+        '/api/recipes/', recipe_data(ingredients_count), format='json')
+    data = recipe_data(ingredients_count)
+    for ingredient in data['ingredients']:
+        ingredient['amount'] = 20
+    with django_assert_num_queries(UPDATE_QUERIES):
+        response = user_client.patch(
+            f'/api/recipes/{response.data["id"]}/', data, format='json')
+    assert response.status_code == 200, response.data
+    assert [
+        ingredient['amount'] for ingredient in response.data['ingredients']
+    ] == [20] * ingredients_count
@@ -0,0 +1,59 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+
+pytestmark = pytest.mark.django_db
+
+WRITE = re.compile(r'^(INSERT INTO|UPDATE|DELETE FROM) "?(\w+)"?')
+
+
+@contextmanager
+def rows_written():
+    """Counts the rows written by the statements by table.
+    """
+    rows = Counter()
+
+    def count(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        match = WRITE.match(sql)
+        if match:
+            rows[match.group(2)] += context['cursor'].rowcount
+        return result
+
+    with connection.execute_wrapper(count):
+        yield rows
+
+
+@pytest.fixture
+def recipe(user_client, recipe_data):
+    return user_client.post(
+        '/api/recipes/', recipe_data(10), format='json').data
+
+
+def test_amount_edit_writes_one_ingredient_row(
+        user_client, recipe_data, recipe):
+    data = recipe_data(10)
+    data['ingredients'][0]['amount'] = 20
+    with rows_written() as rows:
+        response = user_client.patch(
+            f'/api/recipes/{recipe["id"]}/', data, format='json')
+    assert response.status_code == 200, response.data
+    assert rows['recipes_recipeingredients'] == 1
+    assert rows['recipes_recipe_tags'] == 0
+
+
+def test_swap_writes_only_the_changed_rows(
+        user_client, recipe_data, recipe, ingredients, tags):
+    data = recipe_data(10)
+    data['ingredients'][0]['id'] = ingredients[10].id
+    data['tags'] = [tag.id for tag in tags[1:]]
+    with rows_written() as rows:
+        response = user_client.patch(
+            f'/api/recipes/{recipe["id"]}/', data, format='json')
+    assert response.status_code == 200, response.data
+    # One ingredient deleted and one inserted, one tag deleted.
+    assert rows['recipes_recipeingredients'] == 2
+    assert rows['recipes_recipe_tags'] == 1
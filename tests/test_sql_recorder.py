@@ -0,0 +1,21 @@
+import pytest
+
+from monitoring.sql import QueryRecorder
+
+
+@pytest.mark.parametrize('sql', [
+    'SELECT "recipes_recipe"."id" FROM "recipes_recipe"',
+    'SELECT `recipes_recipe`.`id` FROM `recipes_recipe`',
+    'SELECT id FROM recipes_recipe WHERE id = %s',
+    'UPDATE users_user SET is_active = %s',
+])
+def test_recorder_matches_logged_tables(sql):
+    assert QueryRecorder().tables.search(sql)
+
+
+@pytest.mark.parametrize('sql', [
+    'SELECT "jobs_job"."id" FROM "jobs_job"',
+    'SELECT id FROM myrecipes_recipe',
+])
+def test_recorder_skips_other_tables(sql):
+    assert not QueryRecorder().tables.search(sql)
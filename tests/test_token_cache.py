@@ -0,0 +1,66 @@
+import pytest
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+ME = '/api/users/me/'
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def test_token_is_resolved_from_the_cache(
+        shared_cache, token_client, django_assert_num_queries):
+    assert token_client.get(ME).status_code == 200
+    with django_assert_num_queries(0):
+        response = token_client.get(ME + '?fields=id,email')
+    assert response.status_code == 200
+
+
+def test_token_is_not_cached_in_locmem(token_client, django_assert_num_queries):
+    assert token_client.get(ME).status_code == 200
+    with django_assert_num_queries(1):
+        assert token_client.get(ME + '?fields=id').status_code == 200
+
+
+def test_logout_revokes_the_cached_token(shared_cache, token_client):
+    assert token_client.get(ME).status_code == 200
+    response = token_client.post('/api/auth/token/logout/')
+    assert response.status_code == 204
+    assert token_client.get(ME).status_code == 401
+
+
+def test_deactivation_revokes_the_cached_token(
+        shared_cache, user, token_client):
+    assert token_client.get(ME).status_code == 200
+    user.is_active = False
+    user.save()
+    assert token_client.get(ME).status_code == 401
+
+
+def test_deletion_revokes_the_cached_token(shared_cache, user, token_client):
+    assert token_client.get(ME).status_code == 200
+    user.delete()
+    assert token_client.get(ME).status_code == 401
+
+
+def test_password_change_reloads_the_cached_user(
+        shared_cache, user, token_client, django_assert_num_queries):
+    assert token_client.get(ME).status_code == 200
+    response = token_client.post('/api/users/set_password/', {
+        'current_password': 'cook-password',
+        'new_password': 'New-cook-password-1',
+    })
+    assert response.status_code == 204, response.data
+    with django_assert_num_queries(1):
+        assert token_client.get(ME + '?fields=id').status_code == 200
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+from django.core.signals import request_finished
+
+from jobs.models import Job
+from recipes.counters import view_counter
+from recipes.jobs import count_views
+
+pytestmark = pytest.mark.django_db
+
+
+def view_jobs():
+    return [
+        json.loads(job.payload)['args'][0]
+        for job in Job.objects.filter(name=count_views.job_name)
+    ]
+
+
+def test_views_are_written_at_the_end_of_a_request_after_the_interval(
+        settings, user_client, recipe_data):
+    recipe = user_client.post(
+        '/api/recipes/', recipe_data(), format='json').data
+    assert user_client.get(f'/api/recipes/{recipe["id"]}/').status_code == 200
+    assert view_jobs() == []
+    view_counter.flushed -= settings.VIEW_COUNTS_FLUSH_INTERVAL
+    request_finished.send(sender=None)
+    assert view_jobs() == [{str(recipe['id']): 1}]